@@ -1,29 +1,917 @@
 import dash
-from dash import dcc, html, Input, Output, State, callback
+from dash import dcc, html, dash_table, Input, Output, State, ClientsideFunction
 import pandas as pd
-from dash import dash_table
-from dash import ctx
-from dash import Dash
-import plotly.express as px
-import gspread
 import plotly.graph_objects as go
-from oauth2client.service_account import ServiceAccountCredentials
+import plotly.io as pio
+from plotly.colors import sample_colorscale
 import dash_bootstrap_components as dbc
-from pptx.util import Inches, Pt
-from pptx.dml.color import RGBColor
-from datetime import datetime
-from io import BytesIO
+from pathlib import Path
+from cachetools import LRUCache, TTLCache
+import numpy as np
+import base64
+import contextlib
+import hashlib
+import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Only what serving the dashboard needs is imported above. Heavier, optional
+# modules (gspread/oauth2client for Google Sheets, python-pptx for reports,
+# plotly.express) are imported inside the functions that use them, so a worker
+# restart doesn't pay for them. benchmarks/bench_startup.py checks this.
 
 
 source_file = '2025-Belconnen-NPLW-data.xlsx'
+source_sheet = 'individual stats'
+
+# Parsed copies of the workbook live here (see load_source_data)
+cache_dir = Path(os.environ.get("GPS_CACHE_DIR", ".gps_cache"))
+
+# Bump this whenever the cached frame changes shape so old caches get rebuilt
+CACHE_FORMAT_VERSION = 6
+
+# Zone profile columns, grouped into the families the zone chart can show:
+# each family's unit, a scale from the sheet's unit (seconds are shown as
+# minutes) and its (column, zone label) pairs from the lowest zone up
+ZONE_FAMILIES = {
+    'Distance in Speed Zones': {'unit': 'km', 'scale': 1, 'zones': [
+        (f'Distance in Speed Zone {n}  (km)', f'Speed Zone {n}') for n in range(1, 6)
+    ]},
+    'Time in Speed Zones': {'unit': 'min', 'scale': 1 / 60, 'zones': [
+        (f'Time in Speed Zone {n} (secs)', f'Speed Zone {n}') for n in range(1, 6)
+    ]},
+    'Distance in Power Zones': {'unit': 'km', 'scale': 1, 'zones': [
+        (f'Distance in Power Zone: {band} w/kg  (km)', f'{band} w/kg')
+        for band in ['0 - 5', '5 - 10', '10 - 15', '15 - 20', '20 - 25', '25 - 30',
+                     '30 - 35', '35 - 40', '40 - 45', '45 - 50', '> 50']
+    ]},
+    'Time in Power Zones': {'unit': 'min', 'scale': 1 / 60, 'zones': [
+        (f'Time in Power Zone: {band} w/kg (secs)', f'{band} w/kg')
+        for band in ['0 - 5', '5 - 10', '10 - 15', '15 - 20', '20 - 25', '25 - 30',
+                     '30 - 35', '35 - 40', '40 - 45', '45 - 50', '> 50']
+    ]},
+    'Time in HR Load Zones': {'unit': 'min', 'scale': 1 / 60, 'zones': [
+        ('Time in HR Load Zone 0% - 60% Max HR(secs)', '0 - 60% Max HR'),
+        ('Time in HR Load Zone 60% - 75% Max HR (secs)', '60 - 75% Max HR'),
+        ('Time in HR Load Zone 75% - 85% Max HR (secs)', '75 - 85% Max HR'),
+        ('Time in HR Load Zone 85% - 96% Max HR (secs)', '85 - 96% Max HR'),
+        ('Time in HR Load Zone 96% - 100% Max HR (secs)', '96 - 100% Max HR'),
+    ]},
+}
+ZONE_COLUMNS = [column for family in ZONE_FAMILIES.values() for column, _ in family['zones']]
+
+# Acceleration/deceleration zones: each zone's lower limit (m/s/s), and the
+# zone columns for each measure and direction, lowest zone first
+ACCEL_DECEL_ZONE_LIMITS = [0, 1, 2, 3, 4]
+ACCEL_DECEL_ZONE_NAMES = ['0 - 1', '1 - 2', '2 - 3', '3 - 4', '> 4']
+ACCEL_DECEL_MEASURES = {
+    'Count': {'unit': '', 'scale': 1, 'columns': {
+        'Accelerations': [f'Accelerations Zone Count: {zone} m/s/s' for zone in ACCEL_DECEL_ZONE_NAMES],
+        'Decelerations': [f'Deceleration Zone Count: {zone} m/s/s' for zone in ACCEL_DECEL_ZONE_NAMES],
+    }},
+    'Distance': {'unit': 'm', 'scale': 1000, 'columns': {
+        'Accelerations': [f'Distance in Acceleration Zones: {zone} m/s/s  (km)' for zone in ACCEL_DECEL_ZONE_NAMES],
+        'Decelerations': [f'Distance in Deceleration Zones: {zone} m/s/s  (km)' for zone in ACCEL_DECEL_ZONE_NAMES],
+    }},
+    'Time': {'unit': 's', 'scale': 1, 'columns': {
+        'Accelerations': [f'Time in Acceleration Zones: {zone} m/s/s (secs)' for zone in ACCEL_DECEL_ZONE_NAMES],
+        'Decelerations': [f'Time in Deceleration Zones: {zone} m/s/s (secs)' for zone in ACCEL_DECEL_ZONE_NAMES],
+    }},
+}
+
+# The columns the dashboard reads from 'individual stats' and the dtype each one
+# is held as - the schema applied to every load (workbook, cache and Sheets).
+# The other ~30 columns in the sheet are never loaded.
+#  - names, teams, rounds and splits repeat on every row: categoricals
+#  - counts (power plays, impacts, accel/decel zone counts) are small whole numbers: int16
+#  - distances, speeds, zone distances/times and the other measurements: float32
+SOURCE_DTYPES = {
+    'Date': 'datetime64[ns]',
+    'Player Name': 'category',
+    'Team': 'category',
+    'Round': 'category',
+    'Split Name': 'category',
+    'Mins played': 'float32',
+    'Sprint Distance (m)': 'float32',
+    'Power Plays': 'int16',
+    'Player Load': 'float32',
+    'Top Speed (m/s)': 'float32',
+    'Distance Per Min (m/min)': 'float32',
+    'Energy (kcal)': 'float32',
+    'Impacts': 'int16',
+    'Power Score (w/kg)': 'float32',
+    'Work Ratio': 'float32',
+    **{column: 'float32' for column in ZONE_COLUMNS},
+    **{
+        column: 'int16' if measure == 'Count' else 'float32'
+        for measure, spec in ACCEL_DECEL_MEASURES.items()
+        for columns in spec['columns'].values()
+        for column in columns
+    },
+}
+
+
+# start of data loading section
+
+# Hash the workbook in 1 MB chunks so we never hold the whole file twice
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_cache_meta(meta_path):
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+# Streams the sheet row by row (openpyxl read-only mode) and keeps only the
+# columns in `dtypes`. Values go straight into typed buffers as they're read -
+# numbers into compact arrays, strings into category codes - so the full
+# 109-column sheet is never built as a DataFrame of Python objects.
+def read_sheet_columns(path, sheet_name=source_sheet, dtypes=SOURCE_DTYPES):
+    from array import array
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        header = next(rows)
+        positions = {column: header.index(column) for column in dtypes if column in header}
+        missing = [column for column in dtypes if column not in positions]
+        if missing:
+            raise ValueError(f"'{sheet_name}' in {path} is missing columns: {', '.join(missing)}")
+
+        # category -> ({value: code}, codes); number -> typed array; anything else -> list
+        buffers = {}
+        for column in positions:
+            dtype = dtypes[column]
+            if dtype == 'category':
+                buffers[column] = ({}, array('l'))
+            elif np.dtype(dtype).kind in 'iuf':
+                buffers[column] = array(np.dtype(dtype).char)
+            else:
+                buffers[column] = []
+
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            for column, position in positions.items():
+                value = row[position] if position < len(row) else None
+                buffer = buffers[column]
+                if isinstance(buffer, tuple):
+                    categories, codes = buffer
+                    codes.append(-1 if value is None else categories.setdefault(value, len(categories)))
+                elif buffer.__class__ is list:
+                    buffer.append(value)
+                elif not isinstance(value, (int, float)):
+                    buffer.append(float('nan') if buffer.typecode in 'fd' else 0)
+                elif buffer.typecode in 'fd':
+                    buffer.append(value)
+                else:
+                    buffer.append(int(round(value)))
+    finally:
+        workbook.close()
+
+    columns = {}
+    for column, buffer in buffers.items():
+        if isinstance(buffer, tuple):
+            categories, codes = buffer
+            values = pd.Categorical.from_codes(np.frombuffer(codes, dtype='l'), categories=list(categories))
+            # Categories in sorted order, so sorting by the column sorts alphabetically
+            columns[column] = values.reorder_categories(sorted(values.categories))
+        elif buffer.__class__ is list:
+            columns[column] = pd.Series(buffer, dtype=dtypes[column])
+        else:
+            columns[column] = np.frombuffer(buffer, dtype=dtypes[column])
+    return pd.DataFrame(columns)
+
+
+# Loads the 'individual stats' sheet through a columnar Arrow IPC cache.
+# The xlsx is only parsed (slow, openpyxl) when its content hash changes;
+# every other start memory-maps the cached .arrow file instead.
+# Returns the frame and a short data version token taken from the content hash.
+def load_source_data(path=source_file, sheet_name=source_sheet):
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc
+    except ImportError:
+        print("pyarrow is not installed - reading the workbook without a cache")
+        return read_sheet_columns(path, sheet_name), file_sha256(path)[:12]
+
+    stat = os.stat(path)
+    stem = Path(path).stem
+    meta_path = cache_dir / f"{stem}.json"
+    meta = read_cache_meta(meta_path)
+
+    # mtime + size is the cheap check; only re-hash the file when either moved
+    same_file = (
+        meta.get('format') == CACHE_FORMAT_VERSION
+        and meta.get('sheet') == sheet_name
+        and meta.get('mtime_ns') == stat.st_mtime_ns
+        and meta.get('size') == stat.st_size
+    )
+    content_hash = meta['sha256'] if same_file else file_sha256(path)
+    cache_path = cache_dir / f"{stem}-{content_hash[:16]}.arrow"
+
+    if not cache_path.exists() or meta.get('sha256') != content_hash or meta.get('format') != CACHE_FORMAT_VERSION:
+        df_source = read_sheet_columns(path, sheet_name)
+        try:
+            table = pa.Table.from_pandas(df_source, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            print(f"Error: could not cache {path} ({e}) - using the parsed sheet directly")
+            return df_source, content_hash[:12]
+
+        # Write to a temp file and rename so a half-written cache is never picked up.
+        # The pid keeps gunicorn workers reloading at the same time out of each other's way.
+        tmp_path = cache_path.with_suffix(f'.arrow.{os.getpid()}.tmp')
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            with pa.OSFile(str(tmp_path), 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, cache_path)
+
+            # Drop caches built from older versions of this workbook
+            for old_cache in cache_dir.glob(f"{stem}-*.arrow"):
+                if old_cache != cache_path:
+                    old_cache.unlink(missing_ok=True)
+        except OSError as e:
+            # e.g. a read-only deploy or file share: serve the parsed sheet uncached
+            print(f"Error: could not write the cache for {path} ({e}) - using the parsed sheet directly")
+            with contextlib.suppress(OSError):
+                tmp_path.unlink(missing_ok=True)
+            return df_source, content_hash[:12]
+
+    if not same_file or meta.get('sha256') != content_hash:
+        tmp_meta_path = meta_path.with_suffix(f'.json.{os.getpid()}.tmp')
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_meta_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'format': CACHE_FORMAT_VERSION,
+                    'sheet': sheet_name,
+                    'mtime_ns': stat.st_mtime_ns,
+                    'size': stat.st_size,
+                    'sha256': content_hash,
+                }, f, indent=2)
+            os.replace(tmp_meta_path, meta_path)
+        except OSError as e:
+            # The .arrow file is still good; the workbook is just re-hashed next start
+            print(f"Error: could not write {meta_path} ({e})")
+
+    # The memory map stays open for as long as the frame's buffers reference it
+    source = pa.memory_map(str(cache_path), 'r')
+    table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas(split_blocks=True), content_hash[:12]
+
+
+# Sorts the frame by player, split and date so every player's rows - and each
+# split inside them - sit in one contiguous block, then records those blocks as
+# row slices. Callbacks use the slices instead of scanning the whole frame with
+# df[df['Player Name'] == selected_player].
+def build_player_index(df):
+    df = df.sort_values(['Player Name', 'Split Name', 'Date'], kind='stable').reset_index(drop=True)
+
+    player_index = {}
+    groups = df.groupby(['Player Name', 'Split Name'], sort=False, observed=True).indices
+    for (player, split_name), positions in groups.items():
+        player_slice, split_slices = player_index.setdefault(player, [slice(positions[0], positions[0]), {}])
+        split_slices[split_name] = slice(positions[0], positions[-1] + 1)
+        player_index[player][0] = slice(min(player_slice.start, positions[0]), max(player_slice.stop, positions[-1] + 1))
+
+    return df, {player: tuple(entry) for player, entry in player_index.items()}
+
+
+# Rows for one player (optionally one split) as a positional slice of df
+def get_player_rows(selected_player, split_name=None, dataset=None):
+    dataset = dataset or current_dataset
+    df = dataset['df']
+    entry = dataset['player_index'].get(selected_player)
+    if entry is None:
+        return df.iloc[0:0]
+
+    player_slice, split_slices = entry
+    if split_name is None:
+        return df.iloc[player_slice]
+    return df.iloc[split_slices.get(split_name, slice(0, 0))]
+
+
+# Column holding the running total of a direction/measure's first `zones`
+# accel/decel zones, e.g. 'Accelerations Count cum 3' (zones 0-1, 1-2 and 2-3)
+def accel_decel_cum_col(direction, measure, zones):
+    return f"{direction} {measure} cum {zones}"
+
+
+ACCEL_DECEL_CUM_DTYPES = {
+    accel_decel_cum_col(direction, measure, zones): 'int16' if measure == 'Count' else 'float32'
+    for measure, spec in ACCEL_DECEL_MEASURES.items()
+    for direction in spec['columns']
+    for zones in range(1, len(ACCEL_DECEL_ZONE_LIMITS) + 1)
+}
+
+
+# Running totals across each direction/measure's zones, lowest zone first.
+# Computed once at load, so any band of zones is one subtraction per row
+# (see accel_decel_band) whichever thresholds are picked.
+def accel_decel_prefix_sums(df):
+    sums = {}
+    for measure, spec in ACCEL_DECEL_MEASURES.items():
+        for direction, columns in spec['columns'].items():
+            running = df[columns].to_numpy().cumsum(axis=1)
+            for zones in range(1, len(columns) + 1):
+                sums[accel_decel_cum_col(direction, measure, zones)] = running[:, zones - 1]
+    return pd.DataFrame(sums, index=df.index).astype(ACCEL_DECEL_CUM_DTYPES)
+
+
+# A direction/measure's total in the zones from `lower` up to `upper` m/s/s
+# (upper None = no upper limit) for every row of df - the rows of add_derived_metrics,
+# or a split's columns of the wide table
+def accel_decel_band(df, direction, measure, lower, upper=None, split=None):
+    def running_total(limit):
+        zones = len(ACCEL_DECEL_ZONE_LIMITS) if limit is None else ACCEL_DECEL_ZONE_LIMITS.index(limit)
+        if zones == 0:
+            return 0
+        column = accel_decel_cum_col(direction, measure, zones)
+        return df[split_col(column, split) if split else column]
+
+    return running_total(upper) - running_total(lower)
+
+
+# Accel/decel band shown by default: the count of efforts above 3 m/s/s -
+# the one the leaderboard and squad standings use
+DEFAULT_ACCEL_DECEL_BAND = ('Count', 3, None)
+
+
+# A band from the band dropdowns: (measure, lower limit, upper limit or None).
+# An upper limit at or below the lower one means no upper limit.
+def parse_accel_decel_band(measure, lower, upper):
+    if measure not in ACCEL_DECEL_MEASURES or lower not in ACCEL_DECEL_ZONE_LIMITS:
+        return DEFAULT_ACCEL_DECEL_BAND
+    if upper not in ACCEL_DECEL_ZONE_LIMITS or upper <= lower:
+        upper = None
+    return (measure, lower, upper)
+
+
+# e.g. '>3m/s²' or '1-3m/s²'
+def accel_decel_band_label(band):
+    _, lower, upper = band
+    return f">{lower}m/s²" if upper is None else f"{lower}-{upper}m/s²"
+
+
+# Dtypes of the columns add_derived_metrics adds (see SOURCE_DTYPES)
+DERIVED_DTYPES = {
+    'PP per 10min': 'int16',
+    'Sprint Distance per min': 'float32',
+    **ACCEL_DECEL_CUM_DTYPES,
+    'Total Accelerations >3m/s/s': 'int16',
+    'Total Decelerations >3m/s/s': 'int16',
+}
+
+
+# Per-row metrics derived from the raw columns. Computed once over the whole
+# frame at load so callbacks only have to slice and sort.
+def add_derived_metrics(df):
+    mins_played = df['Mins played']
+    prefix_sums = accel_decel_prefix_sums(df)
+
+    derived = pd.DataFrame({
+        'PP per 10min': (
+            (df['Power Plays'] / mins_played) * 10
+        ).replace([float('inf'), -float('inf')], 0).fillna(0).round(0),
+        'Sprint Distance per min': (
+            df['Sprint Distance (m)'] / mins_played
+        ).replace([float('inf'), -float('inf')], 0).fillna(0),
+        **prefix_sums,
+        'Total Accelerations >3m/s/s': accel_decel_band(prefix_sums, 'Accelerations', 'Count', 3),
+        'Total Decelerations >3m/s/s': accel_decel_band(prefix_sums, 'Decelerations', 'Count', 3),
+    }, index=df.index).astype(DERIVED_DTYPES)
+
+    # One concat rather than an insert per column into the (column-per-block) cached frame
+    return pd.concat([df, derived], axis=1)
+
+
+# Splits and metrics pivoted into the season-wide wide table used by every chart
+SNAPSHOT_SPLITS = ['game', '1st.half', '2nd.half']
+SNAPSHOT_METRICS = [
+    'Mins played',
+    'Sprint Distance (m)',
+    'Sprint Distance per min',
+    'Power Plays',
+    'PP per 10min',
+    'Player Load',
+    'Top Speed (m/s)',
+    'Distance Per Min (m/min)',
+    'Energy (kcal)',
+    'Impacts',
+    'Power Score (w/kg)',
+    'Work Ratio',
+    'Total Accelerations >3m/s/s',
+    'Total Decelerations >3m/s/s',
+    *ACCEL_DECEL_CUM_DTYPES,
+]
+
+
+# Wide table column name for a metric in one split, e.g. 'Sprint Distance (m) 1st.half'
+def split_col(metric, split_name):
+    return f"{metric} {split_name}"
+
+
+# One row per player per round (Round + Date) for the whole season, with every
+# metric pivoted out per split, plus the metrics that combine splits. Built once
+# at load; each player's rows are contiguous so a snapshot is just a slice.
+def build_wide_table(df):
+    df_splits = df[df['Split Name'].isin(SNAPSHOT_SPLITS)]
+
+    # Rounds missing a split leave NaN gaps, so every pivoted metric (counts too) is float32
+    # (each round belongs to one team, so Team rides along in the index)
+    df_wide = df_splits.pivot(index=['Player Name', 'Team', 'Round', 'Date'], columns='Split Name', values=SNAPSHOT_METRICS)
+    df_wide = df_wide.astype('float32')
+    df_wide = df_wide.reindex(columns=pd.MultiIndex.from_product([SNAPSHOT_METRICS, SNAPSHOT_SPLITS]))
+    df_wide.columns = [split_col(metric, split_name) for metric, split_name in df_wide.columns]
+    df_wide = df_wide.reset_index()
+
+    # Sprint totals are the sum of both halves, averaged over the game minutes
+    df_wide['Total Sprint Distance'] = (
+        df_wide[split_col('Sprint Distance (m)', '1st.half')].fillna(0)
+        + df_wide[split_col('Sprint Distance (m)', '2nd.half')].fillna(0)
+    )
+    df_wide['Total Avg per min'] = (
+        df_wide['Total Sprint Distance'] / df_wide[split_col('Mins played', 'game')]
+    ).replace([float('inf'), -float('inf')], 0).fillna(0)
+
+    return df_wide
+
+
+# Sorts the wide table by player and date and records each player's rows as a slice
+def index_wide_table(df_wide):
+    df_wide = df_wide.sort_values(['Player Name', 'Date'], kind='stable').reset_index(drop=True)
+    wide_index = {
+        player: slice(positions[0], positions[-1] + 1)
+        for player, positions in df_wide.groupby('Player Name', sort=False, observed=True).indices.items()
+    }
+    return df_wide, wide_index
+
+
+# The charted metrics as leaderboard columns, and how a player's rounds combine
+# season-to-date. Distance per minute is averaged weighted by minutes played,
+# so a ten minute cameo doesn't count as much as a full game.
+LEADERBOARD_METRICS = {
+    'Sprint Distance (m)': 'sum',
+    'Power Plays': 'sum',
+    'Player Load': 'sum',
+    'Top Speed (m/s)': 'max',
+    'Distance Per Min (m/min)': 'weighted mean',
+    'Total Accelerations >3m/s/s': 'sum',
+    'Total Decelerations >3m/s/s': 'sum',
+}
+
+
+# Every player's game-split rows (the per-round boards) plus season-to-date
+# totals per team and player from one groupby. The all-teams board re-combines
+# the per-team totals rather than going back to the rows.
+def build_leaderboard(df):
+    df_rounds = df[df['Split Name'] == 'game'][
+        ['Team', 'Round', 'Date', 'Player Name', 'Mins played', *LEADERBOARD_METRICS]
+    ]
+
+    # Distance per minute is summed as distance-minutes and divided out afterwards
+    df_weighted = df_rounds.assign(**{
+        metric: df_rounds[metric] * df_rounds['Mins played']
+        for metric, how in LEADERBOARD_METRICS.items() if how == 'weighted mean'
+    })
+    totals_agg = {'Games': ('Round', 'size'), 'Mins played': ('Mins played', 'sum')}
+    totals_agg.update({
+        metric: (metric, 'max' if how == 'max' else 'sum') for metric, how in LEADERBOARD_METRICS.items()
+    })
+    df_team_totals = df_weighted.groupby(['Team', 'Player Name'], observed=True).agg(**totals_agg)
+    df_all_totals = df_team_totals.groupby(level='Player Name', observed=True).agg(
+        {column: ('max' if LEADERBOARD_METRICS.get(column) == 'max' else 'sum') for column in df_team_totals.columns}
+    )
+
+    def finish(df_totals, groups):
+        df_totals = df_totals.copy()
+        for metric, how in LEADERBOARD_METRICS.items():
+            if how == 'weighted mean':
+                df_totals[metric] = (df_totals[metric] / df_totals['Mins played']).replace([np.inf, -np.inf], np.nan)
+        df_totals = df_totals.reset_index()
+        return add_squad_standing(df_totals, list(LEADERBOARD_METRICS), groups(df_totals), 'season')
+
+    return {
+        'rounds': df_rounds.sort_values('Date', kind='stable'),
+        # Season standing is within the team, or the whole club on the all-teams board
+        'team_totals': finish(df_team_totals, lambda df_totals: df_totals['Team']),
+        'all_totals': finish(df_all_totals, lambda df_totals: np.zeros(len(df_totals))),
+    }
+
+
+# Column holding a metric's squad standing, e.g. 'Power Plays round pct'
+def standing_col(metric, scope, stat):
+    return f"{metric} {scope} {stat}"
+
+
+# Adds each metric's percentile (0-100, higher value = higher percentile) and
+# z-score within its group - a round, a team - to df in one vectorised rank
+# and transform over all the metrics. A lone player gets z 0 rather than NaN.
+def add_squad_standing(df, columns, groups, scope, metrics=None):
+    metrics = metrics or columns
+    grouped = df[columns].groupby(groups, observed=True)
+    percentiles = grouped.rank(pct=True) * 100
+    z_scores = ((df[columns] - grouped.transform('mean')) / grouped.transform('std')).fillna(0)
+
+    standing = {}
+    for metric, column in zip(metrics, columns):
+        standing[standing_col(metric, scope, 'pct')] = percentiles[column].astype('float32')
+        standing[standing_col(metric, scope, 'z')] = z_scores[column].astype('float32')
+    return df.assign(**standing)
+
+
+# Squad standing for every player-round in the wide table: against everyone who
+# played that round's game, and the player's season-to-date standing in that
+# round's team (from the leaderboard totals). Done for the whole table at load,
+# so a hover label or ranking row is just a column lookup.
+def add_squad_rankings(df_wide, df_team_totals):
+    metrics = list(LEADERBOARD_METRICS)
+    df_wide = add_squad_standing(
+        df_wide, [split_col(metric, 'game') for metric in metrics], df_wide['Round'], 'round', metrics
+    )
+
+    season_columns = [standing_col(metric, 'season', stat) for metric in metrics for stat in ('pct', 'z')]
+    team_player = pd.MultiIndex.from_frame(df_team_totals[['Team', 'Player Name']].astype(str))
+    positions = team_player.get_indexer(pd.MultiIndex.from_frame(df_wide[['Team', 'Player Name']].astype(str)))
+    season = df_team_totals[season_columns].to_numpy()[positions]
+    return df_wide.assign(**{column: season[:, i] for i, column in enumerate(season_columns)})
+
+
+# Training load (acute:chronic workload ratio). Every whole session counts -
+# matches and, when the data has them, training sessions - so only the rows
+# for parts of a match (its 'game' row already covers them) are left out.
+LOAD_METRIC = 'Player Load'
+PARTIAL_SPLITS = ['1st.half', '2nd.half', 'Extra-time']
+ACUTE_DAYS = 7
+CHRONIC_DAYS = 28
+LOAD_COLUMNS = [
+    'Player Name', 'Date', 'Load', 'Acute Load', 'Chronic Load', 'ACWR',
+    'EWMA Acute', 'EWMA Chronic', 'EWMA ACWR',
+]
+
+
+# Each player's total load per calendar day
+def daily_loads(df):
+    df_sessions = df[~df['Split Name'].isin(PARTIAL_SPLITS)]
+    df_daily = df_sessions.groupby(
+        [df_sessions['Player Name'], df_sessions['Date'].dt.normalize()], observed=True
+    )[LOAD_METRIC].sum()
+    return df_daily.rename('Load').reset_index()
+
+
+# Adds the sessions in df_rows to the daily load table (None for a first build)
+# and returns the updated table. Only the players with new sessions are touched,
+# and only from their earliest new day on (or the day after their last known
+# day, to fill a gap): the 27 days before that are reused as window history,
+# and the EWMAs carry on from their values the day before the recomputed days.
+# Windows are calendar-day windows over a zero-filled daily grid (rest days
+# count as zero load). Acute = last 7 days' total load; chronic = average
+# weekly load over the last 28 days; ACWR = acute / chronic. The EWMA versions
+# use the 7/28 day decay constants (alpha = 2 / (N + 1)) on the daily loads.
+def update_load_table(df_load, df_rows):
+    df_new = daily_loads(df_rows)
+    if df_load is None:
+        df_load = pd.DataFrame({column: [] for column in LOAD_COLUMNS}).astype({'Date': 'datetime64[ns]'})
+    if df_new.empty:
+        return df_load
+
+    df_load = df_load.astype({'Player Name': str})
+    df_new = df_new.astype({'Player Name': str})
+    history_days = pd.Timedelta(days=CHRONIC_DAYS - 1)
+    one_day = pd.Timedelta(days=1)
+
+    # Per affected player: the first day to recompute (first new day, or the day
+    # after their last known day if there's a gap), where the stretch starts
+    # (up to 27 days of history before that) and where it ends
+    spans = df_new.groupby('Player Name')['Date'].agg(first_new='min', last_new='max')
+    spans = spans.join(df_load.groupby('Player Name')['Date'].agg(first_old='min', last_old='max'))
+    spans['keep_from'] = pd.concat([spans['first_new'], spans['last_old'] + one_day], axis=1).min(axis=1)
+    spans['start'] = pd.concat([spans['keep_from'] - history_days, spans['first_old']], axis=1).max(axis=1)
+    spans['start'] = spans['start'].where(spans['first_old'].notna(), spans['keep_from'])
+    spans['start'] = pd.concat([spans['start'], spans['keep_from']], axis=1).min(axis=1)
+    spans['end'] = spans[['last_new', 'last_old']].max(axis=1)
+
+    # Zero-filled day grid for each affected player's stretch, old + new loads summed
+    grid = pd.concat([
+        pd.DataFrame({'Player Name': player, 'Date': pd.date_range(span['start'], span['end'], freq='D')})
+        for player, span in spans.iterrows()
+    ], ignore_index=True)
+    loads = pd.concat(
+        [frame for frame in (df_load[['Player Name', 'Date', 'Load']], df_new) if not frame.empty]
+    ).groupby(['Player Name', 'Date'])['Load'].sum()
+    grid_keys = pd.MultiIndex.from_frame(grid[['Player Name', 'Date']])
+    grid['Load'] = loads.reindex(grid_keys).fillna(0).to_numpy()
+
+    # EWMA values from the day before each stretch (0 for a player's first day)
+    previous = df_load.set_index(['Player Name', 'Date'])[['EWMA Acute', 'EWMA Chronic']]
+    seed_keys = pd.MultiIndex.from_arrays([spans.index, spans['start'] - one_day])
+    seeds = previous.reindex(seed_keys).fillna(0).set_axis(spans.index)
+
+    by_player = grid.groupby('Player Name', sort=False)
+    grid['Acute Load'] = by_player.rolling(f'{ACUTE_DAYS}D', on='Date')['Load'].sum().to_numpy()
+    grid['Chronic Load'] = (
+        by_player.rolling(f'{CHRONIC_DAYS}D', on='Date')['Load'].sum().to_numpy() * ACUTE_DAYS / CHRONIC_DAYS
+    )
+
+    # pandas' EWMA starts from the first value; shift it onto the seed instead:
+    # seeded_t = ewm_t + (1 - alpha)^t * (seed - first load), t = 1, 2, ...
+    steps = by_player.cumcount().to_numpy() + 1
+    first_load = by_player['Load'].transform('first').to_numpy()
+    for column, days in (('EWMA Acute', ACUTE_DAYS), ('EWMA Chronic', CHRONIC_DAYS)):
+        alpha = 2 / (days + 1)
+        ewm = by_player['Load'].ewm(alpha=alpha, adjust=False).mean().to_numpy()
+        seed = seeds[column].reindex(grid['Player Name']).to_numpy()
+        grid[column] = ewm + (1 - alpha) ** steps * (seed - first_load)
+
+    grid['ACWR'] = grid['Acute Load'] / grid['Chronic Load'].where(grid['Chronic Load'] > 0)
+    grid['EWMA ACWR'] = grid['EWMA Acute'] / grid['EWMA Chronic'].where(grid['EWMA Chronic'] > 0)
+
+    # Old rows before each player's first new day are unchanged; the grid supplies the rest
+    grid = grid[grid['Date'] >= spans['keep_from'].reindex(grid['Player Name']).to_numpy()]
+    first_new = spans['first_new'].reindex(df_load['Player Name']).to_numpy()
+    unchanged = df_load[~(df_load['Date'] >= first_new)]
+    df_load = pd.concat([frame for frame in (unchanged, grid[LOAD_COLUMNS]) if not frame.empty], ignore_index=True)
+    df_load = df_load.sort_values(['Player Name', 'Date'], kind='stable').reset_index(drop=True)
+    return df_load.astype({column: 'float32' for column in LOAD_COLUMNS[2:]})
+
+
+# Each player's rows in the (player, date sorted) load table as a slice
+def index_load_table(df_load):
+    return {
+        player: slice(positions[0], positions[-1] + 1)
+        for player, positions in df_load.groupby('Player Name', sort=False).indices.items()
+    }
+
+
+# Each wide-table row's ACWR values on the match day, for the Player Load hover
+def add_match_day_load(df_wide, df_load):
+    load_keys = pd.MultiIndex.from_arrays([df_load['Player Name'], df_load['Date']])
+    positions = load_keys.get_indexer(pd.MultiIndex.from_arrays(
+        [df_wide['Player Name'].astype(str), df_wide['Date'].dt.normalize()]
+    ))
+    return df_wide.assign(**{
+        column: df_load[column].reindex(positions).to_numpy(dtype='float32')
+        for column in ('ACWR', 'EWMA ACWR')
+    })
+
+
+# Long-format zone table: one row per player, session split, family and zone,
+# melted once at load (and for new rows only on a merge) so a zone chart just
+# slices a player's rows instead of re-melting ~40 columns per click.
+# Family and zone are fixed categoricals, in ZONE_FAMILIES order.
+ZONE_KEY_COLUMNS = ['Player Name', 'Team', 'Round', 'Date', 'Split Name']
+ZONE_FAMILY_DTYPE = pd.CategoricalDtype(list(ZONE_FAMILIES), ordered=True)
+ZONE_LABEL_DTYPE = pd.CategoricalDtype(
+    list(dict.fromkeys(label for family in ZONE_FAMILIES.values() for _, label in family['zones'])), ordered=True
+)
+ZONE_COLUMN_FAMILY = {column: name for name, family in ZONE_FAMILIES.items() for column, _ in family['zones']}
+ZONE_COLUMN_LABEL = {column: label for family in ZONE_FAMILIES.values() for column, label in family['zones']}
+
+
+def build_zone_table(df):
+    df = df[df['Split Name'].isin(SNAPSHOT_SPLITS)]
+    df_zone = df[ZONE_KEY_COLUMNS + ZONE_COLUMNS].melt(
+        id_vars=ZONE_KEY_COLUMNS, var_name='Column', value_name='Value'
+    )
+    columns = df_zone.pop('Column')
+    df_zone['Family'] = columns.map(ZONE_COLUMN_FAMILY).astype(ZONE_FAMILY_DTYPE)
+    df_zone['Zone'] = columns.map(ZONE_COLUMN_LABEL).astype(ZONE_LABEL_DTYPE)
+    return df_zone.dropna(subset=['Value']).astype({'Value': 'float32'})
+
+
+# Sorts the zone table by player and date and returns it with each player's
+# rows as a slice, like index_wide_table
+def index_zone_table(df_zone):
+    df_zone = df_zone.sort_values(['Player Name', 'Date', 'Split Name', 'Family', 'Zone'], kind='stable')
+    df_zone = df_zone.reset_index(drop=True)
+    zone_index = {
+        player: slice(positions[0], positions[-1] + 1)
+        for player, positions in df_zone.groupby('Player Name', observed=True, sort=False).indices.items()
+    }
+    return df_zone, zone_index
+
+
+# Rows that identify one recording - used to skip rows the dataset already holds,
+# and duplicated export rows, which the wide table's pivot can't take
+ROW_KEY_COLUMNS = ['Player Name', 'Round', 'Date', 'Split Name']
+
+
+# The loaded data and every table derived from it, as one object. Callbacks read
+# current_dataset once and use that throughout, so swapping in a new dataset
+# never mixes old and new tables within a request.
+def build_dataset(df_source, version):
+    df = apply_source_schema(df_source)
+    duplicated = df.duplicated(ROW_KEY_COLUMNS)
+    if duplicated.any():
+        print(f"Skipping {duplicated.sum()} duplicated rows (same player, round, date and split)")
+        df = df[~duplicated]
+    df, player_index = build_player_index(add_derived_metrics(df))
+    return assemble_dataset(
+        version, df, player_index, build_wide_table(df), update_load_table(None, df), build_zone_table(df)
+    )
+
+
+# The tables that are computed across the whole squad - leaderboard totals and
+# squad standings - on top of the per-player df, wide, load and zone tables
+def assemble_dataset(version, df, player_index, df_wide, df_load, df_zone):
+    leaderboard = build_leaderboard(df)
+    df_wide = add_match_day_load(add_squad_rankings(df_wide, leaderboard['team_totals']), df_load)
+    df_wide, wide_index = index_wide_table(df_wide)
+    df_zone, zone_index = index_zone_table(df_zone)
+    return {
+        'version': version,
+        'df': df,
+        'player_index': player_index,
+        'team_players': list_team_players(df),
+        'df_wide': df_wide,
+        'wide_index': wide_index,
+        'leaderboard': leaderboard,
+        'load_table': df_load,
+        'load_index': index_load_table(df_load),
+        'zone_table': df_zone,
+        'zone_index': zone_index,
+    }
+
+
+# {team: sorted names of everyone with at least one row for that team}
+def list_team_players(df):
+    pairs = df[['Team', 'Player Name']].drop_duplicates()
+    return {
+        team: sorted(group['Player Name'])
+        for team, group in pairs.groupby('Team', observed=True)
+    }
+
+
+# Casts any column that isn't already its SOURCE_DTYPES dtype - e.g. a cache
+# written by an older version, or pd.concat falling back to object when two
+# categoricals have different categories (a new player). Columns that already
+# match are left alone, so a memory-mapped frame isn't copied.
+def apply_source_schema(df):
+    casts = {
+        column: dtype for column, dtype in SOURCE_DTYPES.items()
+        if column in df.columns and df[column].dtype != dtype
+    }
+    return df.astype(casts) if casts else df
+
+
+# Returns a new dataset with df_new (raw source rows) appended. Only the new rows
+# get their derived metrics computed and melted into the zone table, only the
+# players they touch are re-pivoted into the wide table, and the load table only
+# recomputes those players from their first new day; everything else is carried
+# over as is. The squad-wide tables (leaderboard, standings) are recomputed - a
+# new round can move everyone's season standing - but those are single
+# vectorised passes.
+def merge_new_rows(dataset, df_new):
+    df_old = dataset['df']
+    seen = pd.MultiIndex.from_frame(df_old[ROW_KEY_COLUMNS])
+    df_new = df_new[~pd.MultiIndex.from_frame(df_new[ROW_KEY_COLUMNS]).isin(seen)]
+    df_new = df_new.drop_duplicates(ROW_KEY_COLUMNS)
+    if df_new.empty:
+        return dataset
+
+    df, player_index = build_player_index(apply_source_schema(
+        pd.concat([df_old, add_derived_metrics(df_new)], ignore_index=True)
+    ))
+
+    players = set(df_new['Player Name'])
+    df_wide_old = dataset['df_wide']
+    df_wide_new = build_wide_table(df[df['Player Name'].isin(players)])
+    df_wide = apply_source_schema(pd.concat(
+        [df_wide_old[~df_wide_old['Player Name'].isin(players)], df_wide_new], ignore_index=True
+    ))
+
+    df_load = update_load_table(dataset['load_table'], df_new)
+    df_zone = apply_source_schema(pd.concat(
+        [dataset['zone_table'], build_zone_table(apply_source_schema(df_new))], ignore_index=True
+    ))
+    return assemble_dataset(
+        f"{dataset['version'].split('+')[0]}+{len(df)}", df, player_index, df_wide, df_load, df_zone
+    )
+
+
+current_dataset = build_dataset(*load_source_data(source_file))
+
+
+# start of season registry section
+
+# Each season is one '<year>-Belconnen-NPLW-data.xlsx' workbook in GPS_DATA_DIR.
+# The current season (source_file) is loaded at startup and kept up to date by
+# the reload and Sheets sync sections. Older seasons are loaded the first time
+# someone picks them, and only GPS_RESIDENT_SEASONS of them stay in memory
+# (least recently used dropped first), however many workbooks pile up.
+data_dir = Path(os.environ.get("GPS_DATA_DIR", "."))
+SEASON_FILE_PATTERN = '*-Belconnen-NPLW-data.xlsx'
+current_season = Path(source_file).name.split('-')[0]
+
+archived_datasets = LRUCache(maxsize=int(os.environ.get("GPS_RESIDENT_SEASONS", 2)))
+archived_datasets_lock = threading.Lock()
+
+# Team selector order; any other team in the data is listed after these
+TEAM_ORDER = ['1sts', 'Reserves', '17s']
+
+
+# {season: workbook path}, newest season first
+def discover_seasons():
+    seasons = {path.name.split('-')[0]: path for path in data_dir.glob(SEASON_FILE_PATTERN)}
+    seasons[current_season] = Path(source_file)
+    return dict(sorted(seasons.items(), reverse=True))
+
+
+# The dataset for a season, loading it on first use. An unknown season, or one
+# whose workbook can't be loaded (e.g. an older export missing columns), falls
+# back to the current one.
+def get_dataset(season=None):
+    if not season or season == current_season:
+        return current_dataset
+
+    with archived_datasets_lock:
+        dataset = archived_datasets.get(season)
+        if dataset is None:
+            path = discover_seasons().get(season)
+            if path is None:
+                print(f"Error: no workbook found for season {season}")
+                return current_dataset
+            try:
+                dataset = build_dataset(*load_source_data(path))
+            except ValueError as e:
+                print(f"Error: could not load season {season}: {e}")
+                return current_dataset
+            archived_datasets[season] = dataset
+    return dataset
+
+
+def sorted_teams(teams):
+    return sorted(teams, key=lambda team: (TEAM_ORDER.index(team) if team in TEAM_ORDER else len(TEAM_ORDER), team))
+
+
+# One row per round for the player with every half/game metric alongside,
+# optionally just the rounds played for one team. Shared by all six charts;
+# a view into the precomputed wide table.
+def get_player_snapshot(selected_player, dataset=None, team=None):
+    dataset = dataset or current_dataset
+    df_wide = dataset['df_wide']
+    player_slice = dataset['wide_index'].get(selected_player)
+    if player_slice is None:
+        return df_wide.iloc[0:0]
+    df_snapshot = df_wide.iloc[player_slice]
+    if team:
+        df_snapshot = df_snapshot[df_snapshot['Team'] == team]
+    return df_snapshot
+
+
+# Round Order / Lowest to Highest / Form (Last 5 Rounds), shared by every chart
+def sort_chart_rows(df_chart, sort_order, value_column):
+    if sort_order == 'value':
+        return df_chart.sort_values(value_column, ascending=True, kind='stable')
+    if sort_order == 'form':
+        return df_chart.sort_values('Date', ascending=False, kind='stable').head(5).sort_values('Date', kind='stable')
+    return df_chart.sort_values('Date', kind='stable')
+
+# Stacks per-point hover values into the customdata array a hovertemplate reads
+# (customdata[0], customdata[1], ...), so hover text is formatted in the browser
+# rather than built as one Python string per point
+def hover_customdata(*columns):
+    return pd.concat([column.reset_index(drop=True) for column in columns], axis=1).to_numpy()
+
+
+# Whole numbers for hover, truncated the way int() did; missing values show as 0
+def hover_int(values):
+    return np.trunc(values.fillna(0)).astype(int)
 
 
-df = pd.read_excel(source_file, sheet_name='individual stats')
+# A metric's round and season squad standing columns (see add_squad_rankings),
+# in the order squad_standing_hover expects them
+def squad_standing_columns(metric):
+    return [standing_col(metric, scope, stat) for scope in ('round', 'season') for stat in ('pct', 'z')]
+
+
+# Hover lines for the four squad_standing_columns values, from customdata[start] on
+def squad_standing_hover(start):
+    return (
+        f"Squad percentile (round): %{{customdata[{start}]:.0f}} (z %{{customdata[{start + 1}]:+.1f}})<br>"
+        f"Squad percentile (season): %{{customdata[{start + 2}]:.0f}} (z %{{customdata[{start + 3}]:+.1f}})"
+    )
+
 
 # Initialize the Dash app with a dark theme
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.CYBORG])
 
+# WSGI entry point for gunicorn (see Procfile.txt / gunicorn.conf.py)
+server = app.server
+
 # Updated layout with player-centric focus
 # Reusable font and button styles
 base_font = {
@@ -36,6 +924,38 @@ title_font = {
     "fontSize": "18px"
 }
 
+dropdown_label_style = {
+    "color": "white",
+    "fontSize": "16px",
+    "fontFamily": base_font["fontFamily"],
+    "fontWeight": "bold"
+}
+
+dropdown_style = {
+    "color": "black",
+    "margin": "0 auto",
+    "textAlign": "center",
+    "fontFamily": base_font["fontFamily"],
+    "fontSize": "14px",
+    "fontWeight": "bold"
+}
+
+table_header_style = {
+    "backgroundColor": "skyblue",
+    "color": "black",
+    "fontWeight": "bold",
+    "fontFamily": base_font["fontFamily"]
+}
+
+table_cell_style = {
+    "backgroundColor": "black",
+    "color": "white",
+    "fontFamily": base_font["fontFamily"],
+    "fontSize": "14px",
+    "textAlign": "center",
+    "padding": "6px"
+}
+
 button_style = {
     "backgroundColor": "skyblue",
     "color": "black",
@@ -55,7 +975,8 @@ app.layout = dbc.Container([
 
     # ✅ Clean title (matches Season Stats style)
     html.H1(
-        "NPLW - GPS Player Data - 2025",
+        f"NPLW - GPS Player Data - {current_season}",
+        id='page-title',
         style={
             "backgroundColor": "#1E3A5F",  # ← updated blue
             "textAlign": "center",
@@ -72,29 +993,57 @@ app.layout = dbc.Container([
     html.Div(style={"height": "20px"}),
 
 
-    # ✅ Player dropdown
+    # ✅ Season, team and player dropdowns
     html.Div([
-        html.Label("Select a Player", style={
-            "color": "white",
-            "fontSize": "16px",
-            "fontFamily": base_font["fontFamily"],
-            "fontWeight": "bold"  # 👈 Added bold text
-        }),
-        dcc.Dropdown(
-            id='player-dropdown',
-            options=[{'label': player, 'value': player} for player in sorted(df['Player Name'].unique())],
-            placeholder='Select a Player',
-            style={
-                "width": "220px",
-                "color": "black",
-                "margin": "0 auto",
-                "textAlign": "center",
-                "fontFamily": base_font["fontFamily"],
-                "fontSize": "14px",
-                "fontWeight": "bold"  # 👈 Also added here
-            }
-        )
-    ], style={"textAlign": "center", "padding": "10px"}),
+        html.Div([
+            html.Label("Season", style=dropdown_label_style),
+            dcc.Dropdown(
+                id='season-dropdown',
+                options=[{'label': season, 'value': season} for season in discover_seasons()],
+                value=current_season,
+                clearable=False,
+                style={**dropdown_style, "width": "120px"}
+            )
+        ], style={"padding": "10px"}),
+        html.Div([
+            html.Label("Team", style=dropdown_label_style),
+            dcc.Dropdown(
+                id='team-dropdown',
+                options=[{'label': team, 'value': team} for team in sorted_teams(current_dataset['team_players'])],
+                placeholder='All Teams',
+                style={**dropdown_style, "width": "150px"}
+            )
+        ], style={"padding": "10px"}),
+        html.Div([
+            html.Label("Select a Player", style=dropdown_label_style),
+            dcc.Dropdown(
+                id='player-dropdown',
+                options=[{'label': player, 'value': player} for player in sorted(current_dataset['player_index'])],
+                placeholder='Select a Player',
+                style={**dropdown_style, "width": "220px"}
+            )
+        ], style={"padding": "10px"}),
+        # Download the selected player's report (see download_report)
+        html.Div([
+            html.Label("Download Report", style=dropdown_label_style),
+            html.Div([
+                html.Button("PowerPoint", id="btn-report-pptx", n_clicks=0, style=button_style),
+                html.Button("Chart Images", id="btn-report-png", n_clicks=0, style=button_style)
+            ]),
+            html.Div(id='report-status', style={**dropdown_label_style, "fontSize": "14px"}),
+            dcc.Download(id='report-download'),
+            dcc.Store(id='report-job'),
+            dcc.Interval(id='report-poll', interval=1000, disabled=True)
+        ], style={"padding": "10px"}),
+    ], style={"display": "flex", "justifyContent": "center", "textAlign": "center"}),
+
+    # Selected player's charts, sorted in the browser by assets/clientside_sort.js
+    dcc.Store(id='player-chart-data'),
+
+    # Data version the page is showing; checked once a minute so a reloaded
+    # workbook (or new sheet rows) reaches open pages without a refresh
+    dcc.Store(id='dataset-version'),
+    dcc.Interval(id='dataset-poll', interval=60 * 1000),
 
 
     html.Br(),
@@ -147,6 +1096,48 @@ app.layout = dbc.Container([
         "marginBottom": "20px"
     }),
 
+    # Training Load (ACWR) - by date, so no sort buttons
+    html.Div([
+        dcc.Graph(id="acwr-chart", style={"backgroundColor": "black"})
+    ], style={
+        "backgroundColor": "#1E3A5F",
+        "padding": "20px",
+        "border": "1px solid white",
+        "borderRadius": "10px",
+        "marginBottom": "20px"
+    }),
+
+    # Zone Profiles (speed / power / HR zones) for the game or either half
+    html.Div([
+        html.Div([
+            dcc.Dropdown(
+                id='zone-family',
+                options=[{'label': family, 'value': family} for family in ZONE_FAMILIES],
+                value='Distance in Speed Zones',
+                clearable=False,
+                style={**dropdown_style, "width": "260px", "margin": "0", "marginRight": "20px"}
+            ),
+            dcc.Dropdown(
+                id='zone-split',
+                options=[
+                    {'label': 'Game', 'value': 'game'},
+                    {'label': '1st Half', 'value': '1st.half'},
+                    {'label': '2nd Half', 'value': '2nd.half'},
+                ],
+                value='game',
+                clearable=False,
+                style={**dropdown_style, "width": "160px", "margin": "0"}
+            )
+        ], style={"display": "flex", "alignItems": "center", "padding": "10px", "paddingLeft": "40px"}),
+        dcc.Graph(id="zone-chart", style={"backgroundColor": "black"})
+    ], style={
+        "backgroundColor": "#1E3A5F",
+        "padding": "20px",
+        "border": "1px solid white",
+        "borderRadius": "10px",
+        "marginBottom": "20px"
+    }),
+
     # Top Speed
     html.Div([
         html.Div([
@@ -186,6 +1177,31 @@ app.layout = dbc.Container([
             html.Button("Lowest to Highest", id="btn-accel-decel-value", n_clicks=0, style=button_style),
             html.Button("Form (Last 5 Rounds)", id="btn-accel-decel-form", n_clicks=0, style=button_style)
         ], style={"textAlign": "left", "padding": "10px", "paddingLeft": "40px"}),
+        # Band of acceleration/deceleration zones to total
+        html.Div([
+            dcc.Dropdown(
+                id='accel-decel-measure',
+                options=[{'label': measure, 'value': measure} for measure in ACCEL_DECEL_MEASURES],
+                value=DEFAULT_ACCEL_DECEL_BAND[0],
+                clearable=False,
+                style={**dropdown_style, "width": "140px", "margin": "0", "marginRight": "10px"}
+            ),
+            dcc.Dropdown(
+                id='accel-decel-lower',
+                options=[{'label': f"from {limit} m/s²", 'value': limit} for limit in ACCEL_DECEL_ZONE_LIMITS],
+                value=DEFAULT_ACCEL_DECEL_BAND[1],
+                clearable=False,
+                style={**dropdown_style, "width": "160px", "margin": "0", "marginRight": "10px"}
+            ),
+            dcc.Dropdown(
+                id='accel-decel-upper',
+                options=[{'label': f"to {limit} m/s²", 'value': limit} for limit in ACCEL_DECEL_ZONE_LIMITS[1:]]
+                + [{'label': "and above", 'value': 'above'}],
+                value='above',
+                clearable=False,
+                style={**dropdown_style, "width": "160px", "margin": "0"}
+            )
+        ], style={"display": "flex", "alignItems": "center", "padding": "10px", "paddingLeft": "40px"}),
         dcc.Graph(id="accel-decel-chart", style={"backgroundColor": "black"})
     ], style={
         "backgroundColor": "#1E3A5F",
@@ -195,6 +1211,61 @@ app.layout = dbc.Container([
         "marginBottom": "20px"
     }),
 
+    # Squad Leaderboard (click a column header to rank by it)
+    html.Div([
+        html.Div([
+            html.Label("Squad Leaderboard", style={**dropdown_label_style, "marginRight": "20px"}),
+            dcc.Dropdown(
+                id='leaderboard-period',
+                options=[{'label': 'Season to Date', 'value': 'season'}],
+                value='season',
+                clearable=False,
+                style={**dropdown_style, "width": "220px", "margin": "0"}
+            )
+        ], style={"display": "flex", "alignItems": "center", "padding": "10px", "paddingLeft": "40px"}),
+        dash_table.DataTable(
+            id='leaderboard-table',
+            columns=[{'name': 'Player', 'id': 'Player Name'}],
+            sort_action='native',
+            sort_by=[{'column_id': 'Sprint Distance (m)', 'direction': 'desc'}],
+            style_header=table_header_style,
+            style_cell=table_cell_style
+        ),
+
+        # Squad Rankings: percentile and z-score for one metric, same period
+        html.Div([
+            html.Label("Squad Rankings", style={**dropdown_label_style, "marginRight": "20px"}),
+            dcc.Dropdown(
+                id='ranking-metric',
+                options=[
+                    {'label': 'Sprint Distance', 'value': 'Sprint Distance (m)'},
+                    {'label': 'Power Plays', 'value': 'Power Plays'},
+                    {'label': 'Player Load', 'value': 'Player Load'},
+                    {'label': 'Top Speed', 'value': 'Top Speed (m/s)'},
+                    {'label': 'Distance Per Min', 'value': 'Distance Per Min (m/min)'},
+                    {'label': 'Accelerations >3m/s²', 'value': 'Total Accelerations >3m/s/s'},
+                    {'label': 'Decelerations >3m/s²', 'value': 'Total Decelerations >3m/s/s'},
+                ],
+                value='Sprint Distance (m)',
+                clearable=False,
+                style={**dropdown_style, "width": "220px", "margin": "0"}
+            )
+        ], style={"display": "flex", "alignItems": "center", "padding": "10px", "paddingLeft": "40px", "marginTop": "20px"}),
+        dash_table.DataTable(
+            id='ranking-table',
+            columns=[{'name': 'Player', 'id': 'Player Name'}],
+            sort_action='native',
+            style_header=table_header_style,
+            style_cell=table_cell_style
+        )
+    ], style={
+        "backgroundColor": "#1E3A5F",
+        "padding": "20px",
+        "border": "1px solid white",
+        "borderRadius": "10px",
+        "marginBottom": "20px"
+    }),
+
     
 
     ], style={
@@ -209,23 +1280,27 @@ app.layout = dbc.Container([
 
 # start of chart section
 
-# this creates/builds the chart for power plays, it is not the layout or the callback.
-def create_power_plays_chart(df_filtered, selected_player, sort_order):
-    # Filter data
-    df_power_plays = df_filtered[df_filtered['Split Name'] == 'game'][['Player Name', 'Round', 'Date', 'Power Plays', 'Mins played']]
+# Game rounds for the Power Plays chart
+def power_plays_rows(df_snapshot):
+    # Game split only
+    df_power_plays = df_snapshot[df_snapshot[split_col('Power Plays', 'game')].notna()]
+    df_power_plays = pd.DataFrame({
+        'Round': df_power_plays['Round'],
+        'Date': df_power_plays['Date'],
+        'Power Plays': df_power_plays[split_col('Power Plays', 'game')],
+        'PP per 10min': df_power_plays[split_col('PP per 10min', 'game')],
+        'Mins played': df_power_plays[split_col('Mins played', 'game')],
+        **{column: df_power_plays[column] for column in squad_standing_columns('Power Plays')},
+    })
+    return df_power_plays
 
-    # Calculate per 10 mins
-    df_power_plays['PP per 10min'] = (
-        (df_power_plays['Power Plays'] / df_power_plays['Mins played']) * 10
-    ).replace([float('inf'), -float('inf')], 0).fillna(0).round(0).astype(int)
+
+# this creates/builds the chart for power plays, it is not the layout or the callback.
+def create_power_plays_chart(df_snapshot, selected_player, sort_order):
+    df_power_plays = power_plays_rows(df_snapshot)
 
     # Sort logic
-    if sort_order == 'date':
-        df_power_plays = df_power_plays.sort_values(by='Date')
-    elif sort_order == 'value':
-        df_power_plays = df_power_plays.sort_values(by='Power Plays', ascending=True)
-    elif sort_order == 'form':
-        df_power_plays = df_power_plays.sort_values(by='Date', ascending=False).head(5).sort_values(by='Date', ascending=True)
+    df_power_plays = sort_chart_rows(df_power_plays, sort_order, 'Power Plays')
 
     # Chart
     fig = go.Figure(data=[
@@ -235,17 +1310,18 @@ def create_power_plays_chart(df_filtered, selected_player, sort_order):
             mode='lines+markers',
             line=dict(color='#00BFFF', width=3),  # Sky Blue
             marker=dict(size=8),
-            hoverinfo='text',
-            hovertext=[
-                f"Round: {round_name}<br>Date: {date}<br>Power Plays: {int(val)}<br>PP per 10min: {int(pp10)}<br>Mins Played: {int(mins)}"
-                for round_name, date, val, pp10, mins in zip(
-                    df_power_plays['Round'],
-                    df_power_plays['Date'].dt.strftime('%d-%m-%Y'),
-                    df_power_plays['Power Plays'],
-                    df_power_plays['PP per 10min'],
-                    df_power_plays['Mins played']
-                )
-            ]
+            customdata=hover_customdata(
+                df_power_plays['Date'].dt.strftime('%d-%m-%Y'),
+                hover_int(df_power_plays['Power Plays']),
+                hover_int(df_power_plays['PP per 10min']),
+                hover_int(df_power_plays['Mins played']),
+                *(df_power_plays[column] for column in squad_standing_columns('Power Plays'))
+            ),
+            hovertemplate=(
+                "Round: %{x}<br>Date: %{customdata[0]}<br>Power Plays: %{customdata[1]:.0f}<br>"
+                "PP per 10min: %{customdata[2]:.0f}<br>Mins Played: %{customdata[3]:.0f}<br>"
+                + squad_standing_hover(4) + "<extra></extra>"
+            )
         )
     ])
 
@@ -287,39 +1363,51 @@ def create_power_plays_chart(df_filtered, selected_player, sort_order):
 
 
 
-# Updated Function to create the Sprint Distance Chart
-def create_sprint_distance_chart(df_filtered, selected_player, sort_order):
-    # Filter data for 1st half, 2nd half, and game splits
-    df_1st_half = df_filtered[df_filtered['Split Name'] == '1st.half'][['Round', 'Date', 'Sprint Distance (m)', 'Mins played']]
-    df_2nd_half = df_filtered[df_filtered['Split Name'] == '2nd.half'][['Round', 'Date', 'Sprint Distance (m)', 'Mins played']]
-    df_game = df_filtered[df_filtered['Split Name'] == 'game'][['Round', 'Date', 'Sprint Distance (m)', 'Mins played']]
-
-    # Rename columns to distinguish between halves
-    df_1st_half = df_1st_half.rename(columns={'Sprint Distance (m)': 'Sprint Distance (m) 1st Half', 'Mins played': 'Mins played 1st Half'})
-    df_2nd_half = df_2nd_half.rename(columns={'Sprint Distance (m)': 'Sprint Distance (m) 2nd Half', 'Mins played': 'Mins played 2nd Half'})
-
-    # Merge 1st and 2nd half data on 'Round' and 'Date'
-    df_sprint = pd.merge(df_1st_half, df_2nd_half, on=['Round', 'Date'], how='outer')
+# Rounds for the Sprint Distance chart, each half alongside the totals
+def sprint_distance_rows(df_snapshot):
+    # Rounds with at least one half recorded
+    has_half = (
+        df_snapshot[split_col('Sprint Distance (m)', '1st.half')].notna()
+        | df_snapshot[split_col('Sprint Distance (m)', '2nd.half')].notna()
+    )
+    df_sprint = df_snapshot[has_half]
+    df_sprint = pd.DataFrame({
+        'Round': df_sprint['Round'],
+        'Date': df_sprint['Date'],
+        'Sprint Distance (m) 1st Half': df_sprint[split_col('Sprint Distance (m)', '1st.half')],
+        'Mins played 1st Half': df_sprint[split_col('Mins played', '1st.half')],
+        'Avg per min 1st Half': df_sprint[split_col('Sprint Distance per min', '1st.half')],
+        'Sprint Distance (m) 2nd Half': df_sprint[split_col('Sprint Distance (m)', '2nd.half')],
+        'Mins played 2nd Half': df_sprint[split_col('Mins played', '2nd.half')],
+        'Avg per min 2nd Half': df_sprint[split_col('Sprint Distance per min', '2nd.half')],
+        'Total Sprint Distance': df_sprint['Total Sprint Distance'],
+        'Total Mins played': df_sprint[split_col('Mins played', 'game')],
+        'Total Avg per min': df_sprint['Total Avg per min'],
+        **{column: df_sprint[column] for column in squad_standing_columns('Sprint Distance (m)')},
+    })
+    return df_sprint
 
-    # Merge total minutes played from the game split
-    df_sprint = pd.merge(df_sprint, df_game[['Round', 'Date', 'Mins played']], on=['Round', 'Date'], how='left')
-    df_sprint = df_sprint.rename(columns={'Mins played': 'Total Mins played'})
 
-    # Calculate total sprint distance and averages for hover
-    df_sprint['Total Sprint Distance'] = df_sprint['Sprint Distance (m) 1st Half'].fillna(0) + df_sprint['Sprint Distance (m) 2nd Half'].fillna(0)
-    df_sprint['Avg per min 1st Half'] = (df_sprint['Sprint Distance (m) 1st Half'] / df_sprint['Mins played 1st Half']).fillna(0).astype(int)
-    df_sprint['Avg per min 2nd Half'] = (df_sprint['Sprint Distance (m) 2nd Half'] / df_sprint['Mins played 2nd Half']).fillna(0).astype(int)
-    df_sprint['Total Avg per min'] = (df_sprint['Total Sprint Distance'] / df_sprint['Total Mins played']).fillna(0).astype(int)
+# Updated Function to create the Sprint Distance Chart
+def create_sprint_distance_chart(df_snapshot, selected_player, sort_order):
+    df_sprint = sprint_distance_rows(df_snapshot)
 
     # Sorting based on the selected sort order
-
-    if sort_order == 'value':
-        df_sprint = df_sprint.sort_values('Total Sprint Distance', ascending=True)
-    elif sort_order == 'form':
-        # Filter the 'game' split data and sort by date to get the last 5 rounds
-        df_sprint = df_sprint.sort_values(by='Date', ascending=False).drop_duplicates(subset=['Round']).head(5).sort_values(by='Date')
-    else:  # Default is to sort by date
-        df_sprint = df_sprint.sort_values(by='Date', ascending=True)
+    df_sprint = sort_chart_rows(df_sprint, sort_order, 'Total Sprint Distance')
+
+    # Hover values shared by both halves
+    sprint_customdata = hover_customdata(
+        hover_int(df_sprint['Sprint Distance (m) 1st Half']),
+        hover_int(df_sprint['Mins played 1st Half']),
+        hover_int(df_sprint['Avg per min 1st Half']),
+        hover_int(df_sprint['Sprint Distance (m) 2nd Half']),
+        hover_int(df_sprint['Mins played 2nd Half']),
+        hover_int(df_sprint['Avg per min 2nd Half']),
+        hover_int(df_sprint['Total Sprint Distance']),
+        hover_int(df_sprint['Total Mins played']),
+        hover_int(df_sprint['Total Avg per min']),
+        *(df_sprint[column] for column in squad_standing_columns('Sprint Distance (m)'))
+    )
 
     # Create the stacked bar chart
     fig = go.Figure(data=[
@@ -328,44 +1416,30 @@ def create_sprint_distance_chart(df_filtered, selected_player, sort_order):
             x=df_sprint['Round'],
             y=df_sprint['Sprint Distance (m) 1st Half'],
             marker_color='#87CEEB',  # Sky blue
-            hoverinfo='text',
-            hovertext=[
-                f"1st Half Sprint Distance: {int(float(val) or 0)} m<br>"
-                f"1st Half Minutes: {int(float(mins) or 0)} min<br>"
-                f"Avg per min: {int(float(avg_per_min) or 0)} m/min<br>"
-                f"Total Sprint Distance: {int(float(total) or 0)} m"
-                for val, mins, avg_per_min, total in zip(
-                    df_sprint['Sprint Distance (m) 1st Half'].fillna(0), 
-                    df_sprint['Mins played 1st Half'].fillna(0), 
-                    df_sprint['Avg per min 1st Half'].fillna(0), 
-                    df_sprint['Total Sprint Distance'].fillna(0)
-                )
-            ]
-
+            customdata=sprint_customdata,
+            hovertemplate=(
+                "1st Half Sprint Distance: %{customdata[0]:.0f} m<br>"
+                "1st Half Minutes: %{customdata[1]:.0f} min<br>"
+                "Avg per min: %{customdata[2]:.0f} m/min<br>"
+                "Total Sprint Distance: %{customdata[6]:.0f} m<br>"
+                + squad_standing_hover(9) + "<extra></extra>"
+            )
         ),
         go.Bar(
             name='2nd Half',
             x=df_sprint['Round'],
             y=df_sprint['Sprint Distance (m) 2nd Half'],
             marker_color='#000080',  # Navy blue
-            hoverinfo='text',
-            hovertext=[
-                f"2nd Half Sprint Distance: {int(float(val) or 0)} m<br>"
-                f"2nd Half Minutes: {int(float(mins) or 0)} min<br>"
-                f"2nd Half Avg per min: {int(float(avg_per_min) or 0)} m/min<br>"
-                f"Total Sprint Distance: {int(float(total) or 0)} m<br>"
-                f"Total Minutes Played: {int(float(total_mins) or 0)} min<br>"
-                f"Total Avg per min: {int(float(total_avg_per_min) or 0)} m/min"
-                for val, mins, avg_per_min, total, total_mins, total_avg_per_min in zip(
-                    df_sprint['Sprint Distance (m) 2nd Half'].fillna(0), 
-                    df_sprint['Mins played 2nd Half'].fillna(0), 
-                    df_sprint['Avg per min 2nd Half'].fillna(0), 
-                    df_sprint['Total Sprint Distance'].fillna(0), 
-                    df_sprint['Total Mins played'].fillna(0), 
-                    df_sprint['Total Avg per min'].fillna(0)
-                )
-            ]
-
+            customdata=sprint_customdata,
+            hovertemplate=(
+                "2nd Half Sprint Distance: %{customdata[3]:.0f} m<br>"
+                "2nd Half Minutes: %{customdata[4]:.0f} min<br>"
+                "2nd Half Avg per min: %{customdata[5]:.0f} m/min<br>"
+                "Total Sprint Distance: %{customdata[6]:.0f} m<br>"
+                "Total Minutes Played: %{customdata[7]:.0f} min<br>"
+                "Total Avg per min: %{customdata[8]:.0f} m/min<br>"
+                + squad_standing_hover(9) + "<extra></extra>"
+            )
         )
     ])
 
@@ -414,32 +1488,31 @@ def create_sprint_distance_chart(df_filtered, selected_player, sort_order):
     return fig
 
 
-# Function to create the Distance Per Min Chart for the player-centric view
-def create_distance_per_min_chart(df_filtered, selected_player, sort_order):
-    # Filter relevant splits
-    df_1st_half = df_filtered[df_filtered['Split Name'] == '1st.half'][['Round', 'Date', 'Distance Per Min (m/min)']]
-    df_2nd_half = df_filtered[df_filtered['Split Name'] == '2nd.half'][['Round', 'Date', 'Distance Per Min (m/min)']]
-    df_game = df_filtered[df_filtered['Split Name'] == 'game'][['Round', 'Date', 'Distance Per Min (m/min)', 'Mins played']]
+# Game rounds for the Distance Per Min chart
+def distance_per_min_rows(df_snapshot):
+    # Game rounds, with each half alongside
+    df_merged = df_snapshot[df_snapshot[split_col('Distance Per Min (m/min)', 'game')].notna()]
+    df_merged = pd.DataFrame({
+        'Round': df_merged['Round'],
+        'Date': df_merged['Date'],
+        'Game': df_merged[split_col('Distance Per Min (m/min)', 'game')],
+        'Mins played': df_merged[split_col('Mins played', 'game')],
+        '1st Half': df_merged[split_col('Distance Per Min (m/min)', '1st.half')],
+        '2nd Half': df_merged[split_col('Distance Per Min (m/min)', '2nd.half')],
+        **{column: df_merged[column] for column in squad_standing_columns('Distance Per Min (m/min)')},
+    })
+    return df_merged
 
-    # Rename for clarity
-    df_1st_half = df_1st_half.rename(columns={'Distance Per Min (m/min)': '1st Half'})
-    df_2nd_half = df_2nd_half.rename(columns={'Distance Per Min (m/min)': '2nd Half'})
-    df_game = df_game.rename(columns={'Distance Per Min (m/min)': 'Game'})
 
-    # Merge all data
-    df_merged = pd.merge(df_game, df_1st_half, on=['Round', 'Date'], how='left')
-    df_merged = pd.merge(df_merged, df_2nd_half, on=['Round', 'Date'], how='left')
+# Function to create the Distance Per Min Chart for the player-centric view
+def create_distance_per_min_chart(df_snapshot, selected_player, sort_order):
+    df_merged = distance_per_min_rows(df_snapshot)
 
     # Handle sort
-    if sort_order == 'value':
-        df_merged = df_merged.sort_values('Game', ascending=True)
-    elif sort_order == 'form':
-        df_merged = df_merged.sort_values('Date', ascending=False).head(5).sort_values('Date')
-    else:
-        df_merged = df_merged.sort_values('Date')
+    df_merged = sort_chart_rows(df_merged, sort_order, 'Game')
 
-    # Fill missing values
-    df_merged = df_merged.fillna(0)
+    # Fill missing values (Round is a categorical, so only the metric columns)
+    df_merged = df_merged.fillna({'Game': 0, 'Mins played': 0, '1st Half': 0, '2nd Half': 0})
 
     # Chart
     fig = go.Figure(data=[
@@ -448,19 +1521,20 @@ def create_distance_per_min_chart(df_filtered, selected_player, sort_order):
             x=df_merged['Round'],
             y=df_merged['Game'],
             marker_color='#1E90FF',  # Blue
-            hoverinfo='text',
-            hovertext=[
-                f"Total: {int(game)} m/min<br>"
-                f"2nd Half: {int(second)} m/min<br>"
-                f"1st Half: {int(first)} m/min<br>"
-                f"Mins Played: {int(mins)} min"
-                for game, second, first, mins in zip(
-                    df_merged['Game'], 
-                    df_merged['2nd Half'], 
-                    df_merged['1st Half'], 
-                    df_merged['Mins played']
-                )
-            ]
+            customdata=hover_customdata(
+                hover_int(df_merged['Game']),
+                hover_int(df_merged['2nd Half']),
+                hover_int(df_merged['1st Half']),
+                hover_int(df_merged['Mins played']),
+                *(df_merged[column] for column in squad_standing_columns('Distance Per Min (m/min)'))
+            ),
+            hovertemplate=(
+                "Total: %{customdata[0]:.0f} m/min<br>"
+                "2nd Half: %{customdata[1]:.0f} m/min<br>"
+                "1st Half: %{customdata[2]:.0f} m/min<br>"
+                "Mins Played: %{customdata[3]:.0f} min<br>"
+                + squad_standing_hover(4) + "<extra></extra>"
+            )
         )
     ])
 
@@ -501,34 +1575,42 @@ def create_distance_per_min_chart(df_filtered, selected_player, sort_order):
     return fig
 
 
-# Updated Function to create the Top Speed Chart for player-centric view
-def create_top_speed_chart(df_filtered, selected_player, sort_order):
-    try:
-        # Extract data for each half and game
-        df_1st_half = df_filtered[df_filtered['Split Name'] == '1st.half'][['Round', 'Top Speed (m/s)', 'Date']]
-        df_2nd_half = df_filtered[df_filtered['Split Name'] == '2nd.half'][['Round', 'Top Speed (m/s)', 'Date']]
-        df_game = df_filtered[df_filtered['Split Name'] == 'game'][['Round', 'Top Speed (m/s)', 'Mins played', 'Date']]
-        
-        df_1st_half = df_1st_half.rename(columns={'Top Speed (m/s)': 'Top Speed (m/s) 1st Half', 'Date': 'Date 1st Half'})
-        df_2nd_half = df_2nd_half.rename(columns={'Top Speed (m/s)': 'Top Speed (m/s) 2nd Half', 'Date': 'Date 2nd Half'})
-    except KeyError as e:
-        print(f"Error: Missing column {e} in the DataFrame.")
-        return go.Figure()
-
-    # Merge 1st and 2nd half speeds, then add game minutes
-    df_top_speed = pd.merge(df_1st_half, df_2nd_half, on='Round', how='outer')
-    df_top_speed = pd.merge(df_top_speed, df_game, on='Round', how='left')
+# Rounds for the Top Speed chart
+def top_speed_rows(df_snapshot):
+    # Rounds with at least one half recorded, plus the game top speed and minutes
+    has_half = (
+        df_snapshot[split_col('Top Speed (m/s)', '1st.half')].notna()
+        | df_snapshot[split_col('Top Speed (m/s)', '2nd.half')].notna()
+    )
+    df_top_speed = df_snapshot[has_half]
+    df_top_speed = pd.DataFrame({
+        'Round': df_top_speed['Round'],
+        'Date': df_top_speed['Date'],
+        'Top Speed (m/s) 1st Half': df_top_speed[split_col('Top Speed (m/s)', '1st.half')],
+        'Top Speed (m/s) 2nd Half': df_top_speed[split_col('Top Speed (m/s)', '2nd.half')],
+        'Top Speed (m/s)': df_top_speed[split_col('Top Speed (m/s)', 'game')],
+        'Mins played': df_top_speed[split_col('Mins played', 'game')],
+        **{column: df_top_speed[column] for column in squad_standing_columns('Top Speed (m/s)')},
+    })
 
-    df_top_speed = df_top_speed.infer_objects(copy=False)
     df_top_speed['Mins played'] = pd.to_numeric(df_top_speed['Mins played'], errors='coerce').fillna(0).astype(int)
+    return df_top_speed
+
+
+# Updated Function to create the Top Speed Chart for player-centric view
+def create_top_speed_chart(df_snapshot, selected_player, sort_order):
+    df_top_speed = top_speed_rows(df_snapshot)
 
     # Sort logic
-    if sort_order == 'form':
-        df_top_speed = df_top_speed.sort_values(by='Date', ascending=False).head(5).sort_values(by='Date', ascending=True)
-    elif sort_order == 'value':
-        df_top_speed = df_top_speed.sort_values(by='Top Speed (m/s)', ascending=True)
-    else:
-        df_top_speed = df_top_speed.sort_values(by='Date', ascending=True)
+    df_top_speed = sort_chart_rows(df_top_speed, sort_order, 'Top Speed (m/s)')
+
+    # Hover values shared by both halves
+    top_speed_customdata = hover_customdata(
+        df_top_speed['Top Speed (m/s) 1st Half'],
+        df_top_speed['Top Speed (m/s) 2nd Half'],
+        df_top_speed['Mins played'],
+        *(df_top_speed[column] for column in squad_standing_columns('Top Speed (m/s)'))
+    )
 
     # Build chart
     fig = go.Figure(data=[
@@ -537,30 +1619,24 @@ def create_top_speed_chart(df_filtered, selected_player, sort_order):
             x=df_top_speed['Round'],
             y=df_top_speed['Top Speed (m/s) 1st Half'],
             marker_color='#87CEEB',  # Sky blue
-            hoverinfo='text',
-            hovertext=[
-                f"1st Half: {speed_1st:.1f} m/s<br>2nd Half: {speed_2nd:.1f} m/s<br>Total Minutes Played: {int(mins)}"
-                for speed_1st, speed_2nd, mins in zip(
-                    df_top_speed['Top Speed (m/s) 1st Half'],
-                    df_top_speed['Top Speed (m/s) 2nd Half'],
-                    df_top_speed['Mins played']
-                )
-            ]
+            customdata=top_speed_customdata,
+            hovertemplate=(
+                "1st Half: %{customdata[0]:.1f} m/s<br>2nd Half: %{customdata[1]:.1f} m/s<br>"
+                "Total Minutes Played: %{customdata[2]:.0f}<br>"
+                + squad_standing_hover(3) + "<extra></extra>"
+            )
         ),
         go.Bar(
             name='2nd Half',
             x=df_top_speed['Round'],
             y=df_top_speed['Top Speed (m/s) 2nd Half'],
             marker_color='#4682B4',  # Steel blue
-            hoverinfo='text',
-            hovertext=[
-                f"2nd Half: {speed_2nd:.1f} m/s<br>1st Half: {speed_1st:.1f} m/s<br>Total Minutes Played: {int(mins)}"
-                for speed_2nd, speed_1st, mins in zip(
-                    df_top_speed['Top Speed (m/s) 2nd Half'],
-                    df_top_speed['Top Speed (m/s) 1st Half'],
-                    df_top_speed['Mins played']
-                )
-            ]
+            customdata=top_speed_customdata,
+            hovertemplate=(
+                "2nd Half: %{customdata[1]:.1f} m/s<br>1st Half: %{customdata[0]:.1f} m/s<br>"
+                "Total Minutes Played: %{customdata[2]:.0f}<br>"
+                + squad_standing_hover(3) + "<extra></extra>"
+            )
         )
     ])
 
@@ -594,16 +1670,30 @@ def create_top_speed_chart(df_filtered, selected_player, sort_order):
     return fig
 
 
+# Game rounds for the Player Load chart
+def player_load_rows(df_snapshot):
+    df_game = df_snapshot[df_snapshot[split_col('Player Load', 'game')].notna()]
+    df_game = pd.DataFrame({
+        'Round': df_game['Round'],
+        'Date': df_game['Date'],
+        'Player Load': df_game[split_col('Player Load', 'game')],
+        'Energy (kcal)': df_game[split_col('Energy (kcal)', 'game')],
+        'Impacts': df_game[split_col('Impacts', 'game')],
+        'Power Score (w/kg)': df_game[split_col('Power Score (w/kg)', 'game')],
+        'Work Ratio': df_game[split_col('Work Ratio', 'game')],
+        'Mins played': df_game[split_col('Mins played', 'game')],
+        **{column: df_game[column] for column in squad_standing_columns('Player Load')},
+        'ACWR': df_game['ACWR'],
+        'EWMA ACWR': df_game['EWMA ACWR'],
+    })
+    return df_game
+
+
 # Updated Function to create the Player Load Chart
-def create_player_load_chart(df_filtered, selected_player, sort_order):
-    df_game = df_filtered[df_filtered['Split Name'] == 'game']
+def create_player_load_chart(df_snapshot, selected_player, sort_order):
+    df_game = player_load_rows(df_snapshot)
 
-    if sort_order == 'form':
-        df_game = df_game.sort_values(by='Date', ascending=False).head(5).sort_values(by='Date', ascending=True)
-    elif sort_order == 'date':
-        df_game = df_game.sort_values(by='Date', ascending=True)
-    else:
-        df_game = df_game.sort_values(by='Player Load', ascending=True)
+    df_game = sort_chart_rows(df_game, sort_order, 'Player Load')
 
     fig = go.Figure(data=[
         go.Scatter(
@@ -612,25 +1702,28 @@ def create_player_load_chart(df_filtered, selected_player, sort_order):
             mode='lines+markers',
             line=dict(color='#00BFFF', width=3),  # Sky Blue line
             marker=dict(size=8),
-            hoverinfo='text',
-            hovertext=[
-                f"Round: {round_value}<br>"
-                f"Player Load: {int(player_load)}<br>"
-                f"Energy: {int(energy)} kcal<br>"
-                f"Impacts: {int(impacts)}<br>"
-                f"Power Score: {power_score:.1f} w/kg<br>"
-                f"Work Ratio: {work_ratio:.1f}<br>"
-                f"Total Minutes Played: {int(total_minutes)} min"
-                for round_value, player_load, energy, impacts, power_score, work_ratio, total_minutes in zip(
-                    df_game['Round'],
-                    df_game['Player Load'],
-                    df_game['Energy (kcal)'],
-                    df_game['Impacts'],
-                    df_game['Power Score (w/kg)'],
-                    df_game['Work Ratio'],
-                    df_game['Mins played']
-                )
-            ]
+            customdata=hover_customdata(
+                hover_int(df_game['Player Load']),
+                hover_int(df_game['Energy (kcal)']),
+                hover_int(df_game['Impacts']),
+                df_game['Power Score (w/kg)'],
+                df_game['Work Ratio'],
+                hover_int(df_game['Mins played']),
+                *(df_game[column] for column in squad_standing_columns('Player Load')),
+                df_game['ACWR'],
+                df_game['EWMA ACWR']
+            ),
+            hovertemplate=(
+                "Round: %{x}<br>"
+                "Player Load: %{customdata[0]:.0f}<br>"
+                "Energy: %{customdata[1]:.0f} kcal<br>"
+                "Impacts: %{customdata[2]:.0f}<br>"
+                "Power Score: %{customdata[3]:.1f} w/kg<br>"
+                "Work Ratio: %{customdata[4]:.1f}<br>"
+                "Total Minutes Played: %{customdata[5]:.0f} min<br>"
+                "ACWR on match day: %{customdata[10]:.2f} (EWMA %{customdata[11]:.2f})<br>"
+                + squad_standing_hover(6) + "<extra></extra>"
+            )
         )
     ])
 
@@ -663,63 +1756,81 @@ def create_player_load_chart(df_filtered, selected_player, sort_order):
 
 
 
-# Updated Function to create the Accel/Decel Chart
-def create_accel_decel_chart(df_filtered, selected_player, sort_order):
-    df_game = df_filtered[df_filtered['Split Name'] == 'game']
+# Game rounds for the Accel/Decel chart, with each direction's total in the band
+# (from the prefix sums, see accel_decel_band). The squad standings only exist
+# for the default band.
+def accel_decel_rows(df_snapshot, band=DEFAULT_ACCEL_DECEL_BAND):
+    measure, lower, upper = band
+    scale = ACCEL_DECEL_MEASURES[measure]['scale']
+    df_game = df_snapshot[df_snapshot[split_col('Total Accelerations >3m/s/s', 'game')].notna()]
+    df_game = pd.DataFrame({
+        'Round': df_game['Round'],
+        'Date': df_game['Date'],
+        **{
+            direction: accel_decel_band(df_game, direction, measure, lower, upper, 'game') * scale
+            for direction in ('Accelerations', 'Decelerations')
+        },
+        **({
+            column: df_game[column]
+            for metric in ('Total Accelerations >3m/s/s', 'Total Decelerations >3m/s/s')
+            for column in squad_standing_columns(metric)
+        } if band == DEFAULT_ACCEL_DECEL_BAND else {}),
+    })
+    return df_game
 
-    acceleration_columns = [
-        'Accelerations Zone Count: 3 - 4 m/s/s',
-        'Accelerations Zone Count: > 4 m/s/s'
-    ]
-    deceleration_columns = [
-        'Deceleration Zone Count: 3 - 4 m/s/s',
-        'Deceleration Zone Count: > 4 m/s/s'
-    ]
 
-    df_game['Total Accelerations >3m/s/s'] = df_game[acceleration_columns].sum(axis=1)
-    df_game['Total Decelerations >3m/s/s'] = df_game[deceleration_columns].sum(axis=1)
+# Updated Function to create the Accel/Decel Chart
+def create_accel_decel_chart(df_snapshot, selected_player, sort_order, band=DEFAULT_ACCEL_DECEL_BAND):
+    df_game = accel_decel_rows(df_snapshot, band)
 
-    if sort_order == 'form':
-        df_game = df_game.sort_values(by='Date', ascending=False).head(5).sort_values(by='Date', ascending=True)
-    elif sort_order == 'date':
-        df_game = df_game.sort_values(by='Date')
-    else:
-        df_game = df_game.sort_values(by='Total Accelerations >3m/s/s')
+    df_game = sort_chart_rows(df_game, sort_order, 'Accelerations')
 
     if df_game.empty:
         return go.Figure()
 
+    measure = band[0]
+    unit = ACCEL_DECEL_MEASURES[measure]['unit']
+    value_format = "%{y:.0f}" + (f" {unit}" if unit else "")
+    has_standing = band == DEFAULT_ACCEL_DECEL_BAND
+
     fig = go.Figure(data=[
         go.Bar(
             name='Accelerations',
             x=df_game['Round'],
-            y=df_game['Total Accelerations >3m/s/s'],
+            y=df_game['Accelerations'],
             marker_color='#00BFFF',
-            hoverinfo='text',
-            hovertext=[
-                f"Round: {round_val}<br>Accelerations: {int(val)}"
-                for round_val, val in zip(df_game['Round'], df_game['Total Accelerations >3m/s/s'])
-            ]
+            customdata=hover_customdata(
+                *(df_game[column] for column in squad_standing_columns('Total Accelerations >3m/s/s'))
+            ) if has_standing else None,
+            hovertemplate=(
+                "Round: %{x}<br>Accelerations: " + value_format
+                + ("<br>" + squad_standing_hover(0) if has_standing else "") + "<extra></extra>"
+            )
         ),
         go.Bar(
             name='Decelerations',
             x=df_game['Round'],
-            y=df_game['Total Decelerations >3m/s/s'],
+            y=df_game['Decelerations'],
             marker_color='#6495ED',
-            hoverinfo='text',
-            hovertext=[
-                f"Round: {round_val}<br>Decelerations: {int(val)}"
-                for round_val, val in zip(df_game['Round'], df_game['Total Decelerations >3m/s/s'])
-            ]
+            customdata=hover_customdata(
+                *(df_game[column] for column in squad_standing_columns('Total Decelerations >3m/s/s'))
+            ) if has_standing else None,
+            hovertemplate=(
+                "Round: %{x}<br>Decelerations: " + value_format
+                + ("<br>" + squad_standing_hover(0) if has_standing else "") + "<extra></extra>"
+            )
         )
     ])
 
     fig.update_layout(
-        title=f"Accelerations/Decelerations >3m/s² - {selected_player}",
+        title=(
+            f"Accelerations/Decelerations {accel_decel_band_label(band)}"
+            + ("" if measure == 'Count' else f" ({measure})") + f" - {selected_player}"
+        ),
         title_font=dict(family="Segoe UI Black", size=24, color="white"),
         title_x=0.5,  # Center the title
         xaxis_title="Round",
-        yaxis_title="Count",
+        yaxis_title=f"{measure} ({unit})" if unit else measure,
         font=dict(family="Segoe UI", size=14, color="white"),
         plot_bgcolor="#1e1e1e",
         paper_bgcolor="#1e1e1e",
@@ -744,254 +1855,1241 @@ def create_accel_decel_chart(df_filtered, selected_player, sort_order):
 
 
 
-# start of callbacks section
+# Daily training load rows for one player (from the dataset's load table).
+# Load is over all of the player's sessions, whichever team they were for.
+def player_load_days(selected_player, dataset=None):
+    dataset = dataset or current_dataset
+    rows = dataset['load_index'].get(selected_player)
+    if rows is None:
+        return dataset['load_table'].iloc[0:0]
+    return dataset['load_table'].iloc[rows]
 
 
-# Define the callback to update the Power Plays chart
-# Updated callback for Power Plays chart without update button
-@app.callback(
-    Output('power-plays-chart', 'figure'),
-    [
-        Input('player-dropdown', 'value'),
-        Input('btn-date', 'n_clicks'),
-        Input('btn-value', 'n_clicks'),
-        Input('btn-form', 'n_clicks')
-    ]
-)
-def update_power_plays_chart(selected_player, btn_date, btn_value, btn_form):
-    if not selected_player:
-        return go.Figure()
+# Acute:chronic workload chart: daily load bars, the 7-day acute and 28-day
+# chronic loads, and both ACWRs on a second axis with the 0.8-1.3 band shaded
+def create_acwr_chart(df_load, selected_player):
+    fig = go.Figure(data=[
+        go.Bar(
+            x=df_load['Date'],
+            y=df_load['Load'],
+            name='Daily Load',
+            marker_color='#4F6D8F',
+            hovertemplate="%{x|%d %b %Y}<br>Load: %{y:.0f}<extra></extra>"
+        ),
+        go.Scatter(
+            x=df_load['Date'],
+            y=df_load['Acute Load'],
+            name=f'Acute ({ACUTE_DAYS} days)',
+            mode='lines',
+            line=dict(color='#FFA500', width=2),
+            hovertemplate="%{x|%d %b %Y}<br>Acute Load: %{y:.0f}<extra></extra>"
+        ),
+        go.Scatter(
+            x=df_load['Date'],
+            y=df_load['Chronic Load'],
+            name=f'Chronic ({CHRONIC_DAYS} days)',
+            mode='lines',
+            line=dict(color='#00BFFF', width=2),
+            hovertemplate="%{x|%d %b %Y}<br>Chronic Load: %{y:.0f} per week<extra></extra>"
+        ),
+        go.Scatter(
+            x=df_load['Date'],
+            y=df_load['ACWR'],
+            name='ACWR',
+            mode='lines',
+            yaxis='y2',
+            line=dict(color='white', width=3),
+            hovertemplate="%{x|%d %b %Y}<br>ACWR: %{y:.2f}<extra></extra>"
+        ),
+        go.Scatter(
+            x=df_load['Date'],
+            y=df_load['EWMA ACWR'],
+            name='EWMA ACWR',
+            mode='lines',
+            yaxis='y2',
+            line=dict(color='white', width=2, dash='dot'),
+            hovertemplate="%{x|%d %b %Y}<br>EWMA ACWR: %{y:.2f}<extra></extra>"
+        ),
+    ])
 
-    # Determine the most recently clicked button to set the sort order
-    ctx = dash.callback_context
-    if not ctx.triggered:
-        sort_order = 'date'
-    else:
-        button_id = ctx.triggered[0]['prop_id'].split('.')[0]
-        if button_id == 'btn-value':
-            sort_order = 'value'
-        elif button_id == 'btn-form':
-            sort_order = 'form'
-        else:
-            sort_order = 'date'
+    fig.add_hrect(y0=0.8, y1=1.3, yref='y2', fillcolor='#32CD32', opacity=0.15, line_width=0)
+
+    fig.update_layout(
+        title=f"Training Load (ACWR) - {selected_player}",
+        title_font=dict(family="Segoe UI Black", size=24, color="white"),
+        title_x=0.5,  # Center the title
+        xaxis_title="Date",
+        yaxis_title="Player Load",
+        font=dict(family="Segoe UI", size=14, color="white"),
+        plot_bgcolor="#1e1e1e",
+        paper_bgcolor="#1e1e1e",
+        xaxis=dict(
+            showline=True,
+            showgrid=False,
+            tickfont=dict(size=14),
+        ),
+        yaxis=dict(
+            showline=True,
+            gridcolor="gray",
+            zeroline=True,
+            tickfont=dict(size=14),
+        ),
+        yaxis2=dict(
+            title="ACWR",
+            overlaying='y',
+            side='right',
+            showgrid=False,
+            rangemode='tozero',
+            tickfont=dict(size=14),
+        ),
+        legend=dict(orientation='h', y=-0.2),
+        hoverlabel=dict(font=dict(family="Segoe UI")),
+        margin=dict(l=20, r=20, t=60, b=20),
+    )
 
-    # Filter data for the selected player across all rounds
-    df_filtered = df[df['Player Name'] == selected_player]
+    return fig
 
-    # Apply sorting based on the selected option
-    if sort_order == 'form':
-        df_filtered = df_filtered[df_filtered['Split Name'] == 'game']
-        df_filtered = df_filtered.sort_values(by='Date', ascending=False).head(5)
-        df_filtered = df_filtered.sort_values(by='Date', ascending=False)
-    elif sort_order == 'date':
-        df_filtered = df_filtered.sort_values(by=['Date'])
-    else:  # 'value' sort order
-        df_filtered = df_filtered.sort_values('Power Plays', ascending=True)
 
-    return create_power_plays_chart(df_filtered, selected_player, sort_order)
 
-# Define the callback to update the Sprint Distance chart
-@app.callback(
-    Output('sprint-distance-chart', 'figure'),
-    [
-        Input('player-dropdown', 'value'),
-        Input('sprint-btn-date', 'n_clicks'),
-        Input('sprint-btn-value', 'n_clicks'),
-        Input('sprint-btn-form', 'n_clicks')
-    ]
+# One player's zone table rows (optionally one team's), in date order
+def player_zone_rows(selected_player, dataset=None, team=None):
+    dataset = dataset or current_dataset
+    rows = dataset['zone_index'].get(selected_player)
+    if rows is None:
+        return dataset['zone_table'].iloc[0:0]
+    df_zone = dataset['zone_table'].iloc[rows]
+    if team:
+        df_zone = df_zone[df_zone['Team'] == team]
+    return df_zone
+
+
+# Zone profile chart: one stacked bar per round (for one split - the game or a
+# half), one segment per zone of the chosen family, lowest zone at the bottom
+def create_zone_chart(df_zone, selected_player, family, split):
+    zone_family = ZONE_FAMILIES[family]
+    df_zone = df_zone[(df_zone['Family'] == family) & (df_zone['Split Name'] == split)]
+    df_zone = df_zone.assign(Value=df_zone['Value'] * zone_family['scale'])
+    round_totals = df_zone.groupby('Round', observed=True)['Value'].transform('sum')
+    df_zone = df_zone.assign(Share=(df_zone['Value'] / round_totals.where(round_totals > 0) * 100).fillna(0))
+
+    labels = [label for _, label in zone_family['zones']]
+    colors = sample_colorscale('Plasma', [i / max(len(labels) - 1, 1) for i in range(len(labels))])
+    fig = go.Figure(data=[
+        go.Bar(
+            x=df_zone_band['Round'],
+            y=df_zone_band['Value'],
+            name=label,
+            marker_color=color,
+            customdata=df_zone_band['Share'],
+            hovertemplate=(
+                "Round: %{x}<br>"
+                f"{label}: %{{y:.2f}} {zone_family['unit']}<br>"
+                "Share of round: %{customdata:.0f}%<extra></extra>"
+            )
+        )
+        for label, color in zip(labels, colors)
+        for df_zone_band in [df_zone[df_zone['Zone'] == label]]
+    ])
+
+    split_titles = {'game': 'Game', '1st.half': '1st Half', '2nd.half': '2nd Half'}
+    fig.update_layout(
+        title=f"{family} ({split_titles.get(split, split)}) - {selected_player}",
+        title_font=dict(family="Segoe UI Black", size=24, color="white"),
+        title_x=0.5,  # Center the title
+        xaxis_title="Round",
+        yaxis_title=f"{family} ({zone_family['unit']})",
+        font=dict(family="Segoe UI", size=14, color="white"),
+        plot_bgcolor="#1e1e1e",
+        paper_bgcolor="#1e1e1e",
+        xaxis=dict(
+            showline=True,
+            showgrid=False,
+            tickfont=dict(size=14),
+            type='category',
+        ),
+        yaxis=dict(
+            showline=True,
+            gridcolor="gray",
+            zeroline=True,
+            tickfont=dict(size=14),
+        ),
+        hoverlabel=dict(font=dict(family="Segoe UI")),
+        margin=dict(l=20, r=20, t=60, b=20),
+        barmode="stack"
+    )
+
+    return fig
+
+
+
+# start of figure cache section
+
+# Chart builders by the id of the dcc.Graph they fill
+CHART_BUILDERS = {
+    'sprint-distance-chart': create_sprint_distance_chart,
+    'power-plays-chart': create_power_plays_chart,
+    'player-load-chart': create_player_load_chart,
+    'top-speed-chart': create_top_speed_chart,
+    'distance-per-min-chart': create_distance_per_min_chart,
+    'accel-decel-chart': create_accel_decel_chart,
+}
+SORT_ORDERS = ['date', 'value', 'form']
+
+# Rows behind each chart and the column 'Lowest to Highest' sorts on
+CHART_SORT_ROWS = {
+    'sprint-distance-chart': (sprint_distance_rows, 'Total Sprint Distance'),
+    'power-plays-chart': (power_plays_rows, 'Power Plays'),
+    'player-load-chart': (player_load_rows, 'Player Load'),
+    'top-speed-chart': (top_speed_rows, 'Top Speed (m/s)'),
+    'distance-per-min-chart': (distance_per_min_rows, 'Game'),
+    'accel-decel-chart': (accel_decel_rows, 'Accelerations'),
+}
+
+try:
+    import orjson
+    FIGURE_JSON_ENGINE = 'orjson'
+except ImportError:
+    orjson = None
+    FIGURE_JSON_ENGINE = 'json'
+
+# Built figures, keyed by (chart id, player, team, sort order, data version, form,
+# accel/decel band).
+# Figures are cached either as go.Figure objects or already serialized to the
+# plain dict Dash sends to the browser, which skips Plotly's validators and
+# numpy encoding on every response.
+# ~60 players x 6 charts x 3 sort orders fits comfortably; the TTL just stops
+# a long-running worker from holding on to figures nobody has looked at in ages.
+figure_cache = TTLCache(
+    maxsize=int(os.environ.get("GPS_FIGURE_CACHE_SIZE", 1500)),
+    ttl=float(os.environ.get("GPS_FIGURE_CACHE_TTL", 12 * 60 * 60))
 )
-def update_sprint_chart(selected_player, btn_date, btn_value, btn_form):
-    if not selected_player:
-        return go.Figure()
+figure_cache_lock = threading.Lock()
+
+
+# `band` is the accel/decel band (see accel_decel_rows) - None for every other chart
+def build_chart_figure(chart_id, selected_player, sort_order, dataset=None, team=None, band=None):
+    df_snapshot = get_player_snapshot(selected_player, dataset, team)
+    if band is None:
+        return CHART_BUILDERS[chart_id](df_snapshot, selected_player, sort_order)
+    return CHART_BUILDERS[chart_id](df_snapshot, selected_player, sort_order, band)
+
+
+# Serializes a figure once (fast orjson engine when installed) into the plain
+# dict Dash sends to the browser
+def figure_to_dict(fig):
+    figure_json = pio.to_json(fig, validate=False, engine=FIGURE_JSON_ENGINE)
+    if orjson is not None:
+        return orjson.loads(figure_json)
+    return json.loads(figure_json)
+
+
+def get_cached(key, build):
+    with figure_cache_lock:
+        value = figure_cache.get(key)
+    if value is not None:
+        return value
+
+    value = build()
+    with figure_cache_lock:
+        figure_cache[key] = value
+    return value
+
+
+# Returns the chart as a pre-serialized figure dict, building it on a miss
+def get_chart_figure_dict(chart_id, selected_player, sort_order, dataset=None, team=None, band=None):
+    dataset = dataset or current_dataset
+    key = (chart_id, selected_player, team, sort_order, dataset['version'], 'json', band)
+    return get_cached(key, lambda: figure_to_dict(
+        build_chart_figure(chart_id, selected_player, sort_order, dataset, team, band)
+    ))
+
+
+# The ACWR chart as a pre-serialized figure dict. It covers all the player's
+# sessions, so it's cached per player rather than per team.
+def get_acwr_figure_dict(selected_player, dataset=None):
+    dataset = dataset or current_dataset
+    key = ('acwr-chart', selected_player, None, 'date', dataset['version'], 'json')
+    return get_cached(key, lambda: figure_to_dict(
+        create_acwr_chart(player_load_days(selected_player, dataset), selected_player)
+    ))
+
+
+# A zone chart as a pre-serialized figure dict, cached per player, team, family and split
+def get_zone_figure_dict(selected_player, family, split, dataset=None, team=None):
+    dataset = dataset or current_dataset
+    key = ('zone-chart', selected_player, team, (family, split), dataset['version'], 'json')
+    return get_cached(key, lambda: figure_to_dict(
+        create_zone_chart(player_zone_rows(selected_player, dataset, team), selected_player, family, split)
+    ))
+
+
+# Plotly stores numeric arrays as base64 typed arrays ({'dtype': 'f8', 'bdata': ...}).
+# The browser-side sort reorders plain lists, so decode them back.
+def typed_arrays_to_lists(figure_dict):
+    figure_dict = dict(figure_dict, data=[dict(trace) for trace in figure_dict.get('data', [])])
+    for trace in figure_dict['data']:
+        for key, value in trace.items():
+            if isinstance(value, dict) and 'bdata' in value:
+                values = np.frombuffer(base64.b64decode(value['bdata']), dtype=value['dtype'])
+                if 'shape' in value:
+                    values = values.reshape([int(n) for n in str(value['shape']).split(',')])
+                trace[key] = values.tolist()
+    return figure_dict
+
+
+# Row positions into the round-order figure for each sort mode of a chart
+def get_chart_sort_orders(chart_id, df_snapshot, band=None):
+    rows_fn, value_column = CHART_SORT_ROWS[chart_id]
+    df_chart = rows_fn(df_snapshot) if band is None else rows_fn(df_snapshot, band)
+    date_order = sort_chart_rows(df_chart, 'date', value_column).index
+    return {
+        sort_order: date_order.get_indexer(sort_chart_rows(df_chart, sort_order, value_column).index).tolist()
+        for sort_order in SORT_ORDERS
+    }
+
+
+# One round chart for the browser: the figure in round order plus the row order
+# for every sort mode
+def get_chart_data(chart_id, selected_player, dataset=None, team=None, band=None):
+    dataset = dataset or current_dataset
+    return {
+        'figure': typed_arrays_to_lists(get_chart_figure_dict(chart_id, selected_player, 'date', dataset, team, band)),
+        'orders': get_chart_sort_orders(chart_id, get_player_snapshot(selected_player, dataset, team), band),
+    }
+
+
+# Everything the browser needs to draw and re-sort one player's charts: each
+# round chart (the accel/decel one in the picked band), and the (unsorted) ACWR chart.
+def get_player_chart_data(selected_player, dataset=None, team=None, accel_decel_band=DEFAULT_ACCEL_DECEL_BAND):
+    dataset = dataset or current_dataset
+
+    def build():
+        chart_data = {
+            chart_id: get_chart_data(
+                chart_id, selected_player, dataset, team,
+                accel_decel_band if chart_id == 'accel-decel-chart' else None
+            )
+            for chart_id in CHART_BUILDERS
+        }
+        chart_data['acwr-chart'] = {'figure': typed_arrays_to_lists(get_acwr_figure_dict(selected_player, dataset))}
+        return chart_data
 
-    # Determine the most recently clicked button
-    ctx = dash.callback_context
-    if not ctx.triggered:
-        sort_order = 'date'
-    else:
-        button_id = ctx.triggered[0]['prop_id'].split('.')[0]
-        if button_id == 'sprint-btn-value':
-            sort_order = 'value'
-        elif button_id == 'sprint-btn-form':
-            sort_order = 'form'
+    return get_cached(('player-chart-data', selected_player, team, dataset['version'], accel_decel_band), build)
+
+
+# Builds every player's chart data up front (GPS_PREWARM_FIGURES=1)
+def prewarm_figure_cache():
+    for selected_player in current_dataset['wide_index']:
+        get_player_chart_data(selected_player)
+
+
+if os.environ.get("GPS_PREWARM_FIGURES") == "1":
+    prewarm_figure_cache()
+
+
+# start of Google Sheets sync section
+
+# Optional live source: a Google Sheet with the same columns as the workbook's
+# 'individual stats' sheet. New rounds appended there are merged in without a
+# redeploy. Leave GPS_SHEET_KEY unset to serve the workbook only.
+SHEET_KEY = os.environ.get("GPS_SHEET_KEY")
+SHEET_WORKSHEET = os.environ.get("GPS_SHEET_WORKSHEET", source_sheet)
+SHEET_CREDENTIALS_FILE = os.environ.get("GPS_SHEET_CREDENTIALS", "service_account.json")
+SHEET_POLL_SECONDS = float(os.environ.get("GPS_SHEET_POLL_SECONDS", 300))
+
+# Sheet rows already merged (row 1 is the header). Starts at the header so the
+# first sync reads the whole sheet; rows already in the workbook are skipped.
+sheet_sync_state = {'rows_synced': 1, 'header': None}
+
+# Serializes writers of current_dataset (readers never lock, they just take a reference)
+dataset_lock = threading.Lock()
+
+
+def open_worksheet():
+    import gspread
+    client = gspread.service_account(filename=SHEET_CREDENTIALS_FILE)
+    return client.open_by_key(SHEET_KEY).worksheet(SHEET_WORKSHEET)
+
+
+# Sheet rows (lists of unformatted values) to a frame with the same columns and
+# dtypes as the source data. Dates come back as serial day numbers.
+def sheet_rows_to_frame(header, rows, df_like):
+    rows = [list(row) + [None] * (len(header) - len(row)) for row in rows]
+    df_new = pd.DataFrame(rows, columns=header).replace('', None)
+    df_new = df_new[[column for column in header if column in df_like.columns]]
+
+    for column in df_new.columns:
+        dtype = df_like[column].dtype
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            serial_days = pd.to_numeric(df_new[column], errors='coerce')
+            # Rounded to the millisecond to drop float noise from the day fraction
+            df_new[column] = pd.to_datetime(serial_days, unit='D', origin='1899-12-30').dt.round('ms')
+        elif pd.api.types.is_integer_dtype(dtype):
+            df_new[column] = pd.to_numeric(df_new[column], errors='coerce').fillna(0).astype(dtype)
+        elif pd.api.types.is_numeric_dtype(dtype):
+            df_new[column] = pd.to_numeric(df_new[column], errors='coerce').astype(dtype)
+    return df_new
+
+
+# Pulls the rows appended to the worksheet since the last sync (row count
+# watermark) and swaps in a dataset with them merged. Works with anything that
+# has gspread's row_values / col_values / get, so a fake worksheet can stand in.
+# Returns how many rows were added.
+def sync_from_worksheet(worksheet, state=None):
+    global current_dataset
+    state = sheet_sync_state if state is None else state
+
+    if state['header'] is None:
+        state['header'] = worksheet.row_values(1)
+    row_count = len(worksheet.col_values(1))
+    if row_count <= state['rows_synced']:
+        return 0
+
+    rows = worksheet.get(
+        f"{state['rows_synced'] + 1}:{row_count}",
+        value_render_option='UNFORMATTED_VALUE',
+        date_time_render_option='SERIAL_NUMBER'
+    )
+    with dataset_lock:
+        dataset = current_dataset
+        current_dataset = merge_new_rows(dataset, sheet_rows_to_frame(state['header'], rows, dataset['df']))
+        state['rows_synced'] = row_count
+    return len(current_dataset['df']) - len(dataset['df'])
+
+
+def run_sheet_sync():
+    worksheet = None
+    while True:
+        try:
+            if worksheet is None:
+                worksheet = open_worksheet()
+            added = sync_from_worksheet(worksheet)
+            if added:
+                print(f"Google Sheets sync: merged {added} new rows")
+        except Exception as e:
+            print(f"Error: Google Sheets sync failed: {e}")
+            worksheet = None
+        time.sleep(SHEET_POLL_SECONDS)
+
+
+# start of workbook reload section
+
+# How often to check the workbook for changes (0 turns the watcher off)
+WORKBOOK_POLL_SECONDS = float(os.environ.get("GPS_WORKBOOK_POLL_SECONDS", 30))
+
+
+def workbook_signature(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+# Parses the workbook and builds every derived table off to the side, then swaps
+# the finished dataset in with a single assignment. A request holds on to the
+# dataset it started with, so it sees either the old data or the new, never a mix.
+def reload_workbook():
+    global current_dataset
+    dataset = build_dataset(*load_source_data(source_file))
+    with dataset_lock:
+        if dataset['version'] == current_dataset['version'].split('+')[0]:
+            return False
+        current_dataset = dataset
+        # Rows merged from the sheet went with the old dataset; re-check every sheet row
+        sheet_sync_state['rows_synced'] = 1
+    print(f"Reloaded {source_file} (data version {dataset['version']})")
+    return True
+
+
+# Polls the workbook's mtime and size. A change is only acted on once the file
+# has stopped changing for one poll, so a copy still in progress isn't parsed.
+def run_workbook_watch():
+    signature = workbook_signature(source_file)
+    pending = False
+    while True:
+        time.sleep(WORKBOOK_POLL_SECONDS)
+        try:
+            new_signature = workbook_signature(source_file)
+            if new_signature != signature:
+                signature = new_signature
+                pending = True
+            elif pending:
+                reload_workbook()
+                pending = False
+        except Exception as e:
+            print(f"Error: could not reload {source_file}: {e}")
+
+
+# Background threads have to start in each process that serves requests - under
+# gunicorn that's every worker (see post_worker_init in gunicorn.conf.py), not the master
+def start_background_tasks():
+    if SHEET_KEY:
+        threading.Thread(target=run_sheet_sync, name='sheet-sync', daemon=True).start()
+    if WORKBOOK_POLL_SECONDS > 0:
+        threading.Thread(target=run_workbook_watch, name='workbook-watch', daemon=True).start()
+    if PRERENDER_IMAGES:
+        threading.Thread(target=run_image_prerender, name='image-prerender', daemon=True).start()
+
+
+# start of leaderboard section
+
+# Built with the dataset (see build_leaderboard), so there's one per data version
+def get_leaderboard(dataset=None):
+    dataset = dataset or current_dataset
+    return dataset['leaderboard']
+
+
+# Period dropdown options: season-to-date, then every round (for the team) in date order
+def get_leaderboard_periods(dataset=None, team=None):
+    df_rounds = get_leaderboard(dataset)['rounds']
+    if team:
+        df_rounds = df_rounds[df_rounds['Team'] == team]
+    rounds = df_rounds['Round'].drop_duplicates().tolist()
+    return [{'label': 'Season to Date', 'value': 'season'}] + [{'label': r, 'value': r} for r in rounds]
+
+
+# Table rows for one team (or all) and period, rounded for display. Cached, so
+# showing the leaderboard is a single lookup per data version.
+def get_leaderboard_rows(dataset=None, team=None, period='season'):
+    dataset = dataset or current_dataset
+
+    def build():
+        leaderboard = get_leaderboard(dataset)
+        if period == 'season':
+            df_board = leaderboard['team_totals'] if team else leaderboard['all_totals']
+        else:
+            df_board = leaderboard['rounds'][leaderboard['rounds']['Round'] == period]
+        if team:
+            df_board = df_board[df_board['Team'] == team]
+        columns = [column for column in ['Player Name', 'Games', 'Mins played', *LEADERBOARD_METRICS] if column in df_board]
+        return table_records(df_board[columns])
+
+    return get_cached(('leaderboard-rows', team, period, dataset['version']), build)
+
+
+# Squad ranking rows for one metric, best first: each player's value with their
+# percentile and z-score for the round (and season-to-date alongside), or just
+# season-to-date. Read straight from the standings computed at load.
+def get_ranking_rows(dataset=None, team=None, period='season', metric='Sprint Distance (m)'):
+    dataset = dataset or current_dataset
+
+    def build():
+        if period == 'season':
+            leaderboard = get_leaderboard(dataset)
+            df_rank = leaderboard['team_totals'] if team else leaderboard['all_totals']
+            columns = {'Player Name': 'Player Name', metric: 'Value'}
+            sort_column = standing_col(metric, 'season', 'pct')
         else:
-            sort_order = 'date'
+            df_wide = dataset['df_wide']
+            df_rank = df_wide[df_wide['Round'] == period]
+            columns = {'Player Name': 'Player Name', split_col(metric, 'game'): 'Value'}
+            sort_column = standing_col(metric, 'round', 'pct')
+            columns[standing_col(metric, 'round', 'pct')] = 'Round Percentile'
+            columns[standing_col(metric, 'round', 'z')] = 'Round Z'
+        columns[standing_col(metric, 'season', 'pct')] = 'Season Percentile'
+        columns[standing_col(metric, 'season', 'z')] = 'Season Z'
+        if team:
+            df_rank = df_rank[df_rank['Team'] == team]
+        df_rank = df_rank.sort_values(sort_column, ascending=False, kind='stable')
+        return table_records(df_rank[list(columns)].rename(columns=columns))
+
+    return get_cached(('ranking-rows', team, period, metric, dataset['version']), build)
+
+
+# Leaderboard/ranking frame to DataTable rows
+def table_records(df_table):
+    df_table = df_table.copy()
+    df_table['Player Name'] = df_table['Player Name'].astype(str)
+    # float32 -> float64 before rounding, so 7.6 shows as 7.6 and not 7.599999904632568
+    for column in df_table.columns[1:]:
+        if df_table[column].dtype.kind == 'f':
+            df_table[column] = df_table[column].astype('float64').round(1)
+    return df_table.to_dict('records')
+
+
+def table_columns(rows):
+    names = {'Player Name': 'Player', 'Mins played': 'Mins'}
+    columns = list(rows[0]) if rows else ['Player Name']
+    return [
+        {'name': names.get(column, column), 'id': column, 'type': 'text' if column == 'Player Name' else 'numeric'}
+        for column in columns
+    ]
 
-    # Filter data for selected player
-    df_filtered = df[df['Player Name'] == selected_player]
 
-    # Return the chart
-    return create_sprint_distance_chart(df_filtered, selected_player, sort_order)
+# start of report export section
 
+# Player reports: one PowerPoint slide per round chart, rendered to PNG with
+# kaleido. Rendering a static image costs ~50-100 ms of single-threaded CPU per
+# chart (plus ~1 s to start kaleido's Chromium the first time in a process),
+# so the batch command fans players out across a process pool.
+REPORT_CHARTS = list(CHART_BUILDERS)
+REPORT_IMAGE_WIDTH = 1600
+REPORT_IMAGE_HEIGHT = 800
+REPORT_BACKGROUND = '1E3A5F'
 
-# Define the callback to update the Player Load chart
-# Updated callback for Player Load chart without update button
-@app.callback(
-    Output('player-load-chart', 'figure'),
-    [
-        Input('player-dropdown', 'value'),
-        Input('btn-player-load-date', 'n_clicks'),
-        Input('btn-player-load-value', 'n_clicks'),
-        Input('btn-player-load-form', 'n_clicks')
+
+# The report charts for one player as PNG bytes, in REPORT_CHARTS order. The
+# snapshot is sliced once and every chart is built from it; the images come
+# from the image cache when they've been rendered before (see get_chart_image).
+def render_report_images(selected_player, dataset=None, team=None):
+    df_snapshot = get_player_snapshot(selected_player, dataset, team)
+    return [
+        get_chart_image(figure_to_dict(CHART_BUILDERS[chart_id](df_snapshot, selected_player, 'date')))
+        for chart_id in REPORT_CHARTS
     ]
-)
-def update_player_load_chart(selected_player, btn_date, btn_value, btn_form):
-    if not selected_player:
-        return go.Figure()
 
-    # Determine the most recently clicked button to set the sort order
-    ctx = dash.callback_context
-    if not ctx.triggered:
-        sort_order = 'date'
-    else:
-        button_id = ctx.triggered[0]['prop_id'].split('.')[0]
-        if button_id == 'btn-player-load-value':
-            sort_order = 'value'
-        elif button_id == 'btn-player-load-form':
-            sort_order = 'form'
-        else:
-            sort_order = 'date'
 
-    # Filter and sort
-    df_filtered = df[df['Player Name'] == selected_player]
+# Pool worker: a player's images for a season/team (each worker loads the
+# season itself, so only names and image bytes cross the process boundary)
+def render_report_images_job(job):
+    selected_player, season, team = job
+    return render_report_images(selected_player, get_dataset(season), team)
+
+
+def new_report_deck():
+    from pptx import Presentation
+    from pptx.util import Inches
+
+    deck = Presentation()
+    deck.slide_width = Inches(13.333)  # 16:9
+    deck.slide_height = Inches(7.5)
+    return deck
+
+
+# Adds a title slide for the player and one slide per chart image
+def add_player_slides(deck, selected_player, subtitle, images):
+    from io import BytesIO
+    from pptx.dml.color import RGBColor
+    from pptx.util import Inches, Pt
+
+    def blank_slide():
+        slide = deck.slides.add_slide(deck.slide_layouts[6])
+        slide.background.fill.solid()
+        slide.background.fill.fore_color.rgb = RGBColor.from_string(REPORT_BACKGROUND)
+        return slide
+
+    slide = blank_slide()
+    for text, top, size in ((selected_player, 2.6, 44), (subtitle, 3.8, 20)):
+        text_box = slide.shapes.add_textbox(Inches(0.5), Inches(top), deck.slide_width - Inches(1), Inches(1))
+        paragraph = text_box.text_frame.paragraphs[0]
+        paragraph.text = text
+        paragraph.font.size = Pt(size)
+        paragraph.font.bold = size > 30
+        paragraph.font.color.rgb = RGBColor(0xFF, 0xFF, 0xFF)
+
+    image_width = deck.slide_width - Inches(0.66)
+    image_height = int(image_width * REPORT_IMAGE_HEIGHT / REPORT_IMAGE_WIDTH)
+    for image in images:
+        slide = blank_slide()
+        slide.shapes.add_picture(
+            BytesIO(image), Inches(0.33), (deck.slide_height - image_height) // 2, image_width, image_height
+        )
 
-    if sort_order == 'form':
-        df_filtered = df_filtered[df_filtered['Split Name'] == 'game']
-        df_filtered = df_filtered.sort_values(by='Date', ascending=False).head(5)
-        df_filtered = df_filtered.sort_values(by='Date', ascending=False)
-    elif sort_order == 'date':
-        df_filtered = df_filtered.sort_values(by=['Date'])
-    else:
-        df_filtered = df_filtered.sort_values('Player Load', ascending=True)
 
-    return create_player_load_chart(df_filtered, selected_player, sort_order)
+def report_subtitle(season, team):
+    from datetime import datetime
 
+    parts = [f"NPLW GPS Report - {season}", team, datetime.now().strftime('%d %b %Y')]
+    return " - ".join(part for part in parts if part)
 
 
-# Define the callback to update the Accelerations and Decelerations chart
-@app.callback(
-    Output('accel-decel-chart', 'figure'),
-    [
-        Input('btn-accel-decel-date', 'n_clicks'),
-        Input('btn-accel-decel-value', 'n_clicks'),
-        Input('btn-accel-decel-form', 'n_clicks'),
-        Input('player-dropdown', 'value')
-    ]
-)
+# Player names go into file names as they are, minus path separators
+def report_file_name(name, season):
+    safe_name = "".join('_' if char in '/\\:*?"<>|' else char for char in name)
+    return f"{safe_name} - {season} GPS report.pptx"
+
+
+# Batch report command: renders every player's charts (or just `players`) in a
+# process pool and writes one deck per player to out_dir, or a single squad
+# deck with a title slide per player. Decks are assembled in this process as
+# each player's images come back, in player order.
+def write_reports(out_dir, players=None, season=None, team=None, squad_deck=False, workers=None):
+    from concurrent.futures import ProcessPoolExecutor
 
-def update_accel_decel_chart(btn_date, btn_value, btn_form, selected_player):
-    # Determine the most recently clicked button to set the sort order
-    ctx = dash.callback_context
-    if not ctx.triggered:
-        sort_order = 'date'
+    try:
+        import kaleido  # noqa: F401 - plotly's static image engine
+    except ImportError:
+        print("Error: reports need kaleido (pip install kaleido==0.2.1)")
+        return []
+
+    season = season or current_season
+    dataset = get_dataset(season)
+    players = players or (dataset['team_players'].get(team, []) if team else sorted(dataset['wide_index']))
+    unknown = [player for player in players if player not in dataset['wide_index']]
+    if unknown:
+        print(f"Error: no data for {', '.join(unknown)} in {season}")
+        players = [player for player in players if player not in unknown]
+    if not players:
+        return []
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    subtitle = report_subtitle(season, team)
+    workers = workers or min(os.cpu_count() or 1, len(players))
+    written = []
+
+    deck = new_report_deck() if squad_deck else None
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        jobs = [(player, season, team) for player in players]
+        for player, images in zip(players, pool.map(render_report_images_job, jobs)):
+            if squad_deck:
+                add_player_slides(deck, player, subtitle, images)
+                continue
+            player_deck = new_report_deck()
+            add_player_slides(player_deck, player, subtitle, images)
+            path = out_dir / report_file_name(player, season)
+            player_deck.save(path)
+            written.append(path)
+            print(f"Wrote {path}")
+
+    if squad_deck:
+        path = out_dir / report_file_name(f"Squad{' ' + team if team else ''}", season)
+        deck.save(path)
+        written.append(path)
+        print(f"Wrote {path}")
+    return written
+
+
+# Reports downloaded from the dashboard: the selected player's deck (or a zip of
+# the chart images), kept on disk in REPORT_CACHE_DIR per player, team, data
+# version and format so match-day repeat downloads don't re-render. Rendering
+# runs on a one-thread executor rather than the request thread - a click just
+# starts the job and the page polls for it - so a gunicorn worker keeps answering
+# chart callbacks while kaleido works. The polls can land on any worker, so the
+# finished file and a lock file held while rendering are what every worker goes
+# by: only the worker that gets the lock renders, the others wait for the file.
+# If REPORT_CACHE_DIR can't be written (read-only deploy or file share), reports
+# are built in memory and kept per worker in report_memory_cache instead.
+REPORT_CACHE_DIR = Path(os.environ.get("GPS_REPORT_CACHE_DIR", cache_dir / 'reports'))
+REPORT_CACHE_SIZE = int(os.environ.get("GPS_REPORT_CACHE_SIZE", 20))
+REPORT_EXTENSIONS = {'pptx': 'pptx', 'png': 'zip'}
+
+# {report path: future} for the renders this process started
+report_jobs = {}
+report_memory_cache = LRUCache(maxsize=REPORT_CACHE_SIZE)
+# Cleared the first time the report cache can't be written
+report_cache_writable = True
+report_lock = threading.Lock()
+report_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='report')
+
+
+# Held while one process works on a shared file; yields False if another process
+# holds it. No-op where fcntl is missing (Windows).
+@contextlib.contextmanager
+def file_lock(lock_path):
+    try:
+        import fcntl
+    except ImportError:
+        yield True
+        return
+
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, 'w') as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def report_bytes(selected_player, season, team, report_format):
+    from io import BytesIO
+
+    images = render_report_images(selected_player, get_dataset(season), team)
+    buffer = BytesIO()
+    if report_format == 'png':
+        import zipfile
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            for chart_id, image in zip(REPORT_CHARTS, images):
+                archive.writestr(f"{chart_id}.png", image)
     else:
-        button_id = ctx.triggered[0]['prop_id'].split('.')[0]
-        if button_id == 'btn-accel-decel-value':
-            sort_order = 'value'
-        elif button_id == 'btn-accel-decel-form':
-            sort_order = 'form'
+        deck = new_report_deck()
+        add_player_slides(deck, selected_player, report_subtitle(season or current_season, team), images)
+        deck.save(buffer)
+    return buffer.getvalue()
+
+
+def report_path(job, dataset):
+    key = json.dumps([job['player'], job['team'], dataset['version'], job['format']])
+    name = hashlib.sha256(key.encode('utf-8')).hexdigest()
+    return REPORT_CACHE_DIR / f"{name}.{REPORT_EXTENSIONS[job['format']]}"
+
+
+# Renders the job's report to its path unless another process is already
+# rendering it or it's there by now (returns None), then drops all but the
+# newest REPORT_CACHE_SIZE reports. Where the cache can't be written, returns
+# the report's bytes instead.
+def write_report_file(path, job):
+    global report_cache_writable
+    with contextlib.ExitStack() as stack:
+        locked = None
+        if report_cache_writable:
+            try:
+                locked = stack.enter_context(file_lock(path.with_suffix('.lock')))
+            except OSError as e:
+                print(f"Error: could not write to the report cache {REPORT_CACHE_DIR} ({e}) - building reports in memory")
+                report_cache_writable = False
+        if locked is None:
+            return report_bytes(job['player'], job['season'], job['team'], job['format'])
+        if not locked or path.exists():
+            return None
+
+        content = report_bytes(job['player'], job['season'], job['team'], job['format'])
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_bytes(content)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error: could not write to the report cache {REPORT_CACHE_DIR} ({e}) - building reports in memory")
+            report_cache_writable = False
+            with contextlib.suppress(OSError):
+                tmp_path.unlink(missing_ok=True)
+            return content
+
+    with contextlib.suppress(OSError):
+        reports = sorted(
+            (report for extension in set(REPORT_EXTENSIONS.values()) for report in REPORT_CACHE_DIR.glob(f"*.{extension}")),
+            key=lambda report: report.stat().st_mtime, reverse=True
+        )
+        for old_report in reports[REPORT_CACHE_SIZE:]:
+            old_report.unlink(missing_ok=True)
+            old_report.with_suffix('.lock').unlink(missing_ok=True)
+    return None
+
+
+# The finished report for a job ({'player', 'season', 'team', 'format'}) as
+# (file name, bytes), or None while it is still rendering (starting it if
+# need be). Raises whatever a render this process started raised.
+def get_report(job):
+    path = report_path(job, get_dataset(job['season']))
+    with report_lock:
+        future = report_jobs.pop(path, None)
+        if future is not None and not future.done():
+            report_jobs[path] = future
+            return None
+        content = future.result() if future is not None else None
+        if content is not None:
+            report_memory_cache[path] = content
         else:
-            sort_order = 'date'
+            content = report_memory_cache.get(path)
+        if content is None:
+            try:
+                content = path.read_bytes()
+            except OSError:
+                # Also when another worker holds the lock: this job then just
+                # returns, and the next poll looks again
+                report_jobs[path] = report_executor.submit(write_report_file, path, job)
+                return None
+
+    file_name = report_file_name(job['player'], job['season'] or current_season)
+    if job['format'] == 'png':
+        file_name = file_name.replace('.pptx', ' charts.zip')
+    return file_name, content
+
+
+# start of image cache section
+
+# Rendered chart images on disk, content-addressed: an image's file name is the
+# hash of what it draws (the figure minus its hover-only fields, plus format and
+# size). A chart whose data hasn't changed hashes to the same file whatever the
+# data version, so it's never rendered twice - across restarts, gunicorn workers
+# and report processes - and a changed chart simply gets a new file. Safe to
+# delete at any time.
+IMAGE_CACHE_DIR = Path(os.environ.get("GPS_IMAGE_CACHE_DIR", cache_dir / 'images'))
+HOVER_ONLY_KEYS = ('customdata', 'hovertemplate', 'hovertext', 'hoverinfo')
+
+# Background pre-render of every player x chart x sort order (GPS_PRERENDER_IMAGES=1)
+PRERENDER_IMAGES = os.environ.get("GPS_PRERENDER_IMAGES") == "1"
+PRERENDER_POLL_SECONDS = float(os.environ.get("GPS_PRERENDER_POLL_SECONDS", 60))
+PRERENDER_DONE_FILE = '.prerendered-version'
+
+# {player: fingerprint of their rows when last pre-rendered}
+prerendered_rows = {}
+
+# Cleared the first time an image can't be written, so later renders skip the attempt
+image_cache_writable = True
+
+
+def figure_image_key(figure_dict, image_format, width, height):
+    drawn = {
+        'data': [
+            {key: value for key, value in trace.items() if key not in HOVER_ONLY_KEYS}
+            for trace in figure_dict.get('data', [])
+        ],
+        'layout': {key: value for key, value in figure_dict.get('layout', {}).items() if key != 'hoverlabel'},
+    }
+    payload = json.dumps([drawn, image_format, width, height], sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def chart_image_path(figure_dict, image_format='png', width=REPORT_IMAGE_WIDTH, height=REPORT_IMAGE_HEIGHT):
+    key = figure_image_key(figure_dict, image_format, width, height)
+    return IMAGE_CACHE_DIR / key[:2] / f"{key}.{image_format}"
+
+
+# Renders the figure with kaleido and saves it at `path`. If the cache can't be
+# written (read-only deploy or file share) the image is still returned, just
+# not kept - reports and downloads then work from memory as before the cache.
+def render_chart_image(figure_dict, path, image_format='png', width=REPORT_IMAGE_WIDTH, height=REPORT_IMAGE_HEIGHT):
+    global image_cache_writable
+    image = pio.to_image(figure_dict, format=image_format, width=width, height=height, validate=False)
+    if not image_cache_writable:
+        return image
+
+    # Written under a per-thread name and renamed, so a reader never sees half a file
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(image)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Error: could not write to the image cache {IMAGE_CACHE_DIR} ({e}) - rendering charts without it")
+        image_cache_writable = False
+        with contextlib.suppress(OSError):
+            tmp_path.unlink(missing_ok=True)
+    return image
+
+
+# The figure's image bytes (PNG by default, 'svg' works too) - a file read once
+# it's been rendered
+def get_chart_image(figure_dict, image_format='png', width=REPORT_IMAGE_WIDTH, height=REPORT_IMAGE_HEIGHT):
+    path = chart_image_path(figure_dict, image_format, width, height)
+    try:
+        return path.read_bytes()
+    except OSError:
+        return render_chart_image(figure_dict, path, image_format, width, height)
+
+
+def player_rows_fingerprint(selected_player, dataset=None):
+    rows = get_player_rows(selected_player, dataset=dataset)
+    return hashlib.sha256(pd.util.hash_pandas_object(rows, index=False).to_numpy().tobytes()).hexdigest()
+
+
+# Renders every chart in every sort order for the players whose rows changed
+# since their last pre-render (all of them the first time). Charts that come
+# out the same as an image already on disk cost a figure build and a hash, not
+# a render. Returns how many images were rendered.
+def prerender_images(dataset=None):
+    dataset = dataset or current_dataset
+    rendered = 0
+    for selected_player in sorted(dataset['wide_index']):
+        fingerprint = player_rows_fingerprint(selected_player, dataset)
+        if prerendered_rows.get(selected_player) == fingerprint:
+            continue
+        for chart_id in CHART_BUILDERS:
+            for sort_order in SORT_ORDERS:
+                figure_dict = get_chart_figure_dict(chart_id, selected_player, sort_order, dataset)
+                path = chart_image_path(figure_dict)
+                if not path.exists():
+                    render_chart_image(figure_dict, path)
+                    if not image_cache_writable:
+                        # Nothing would be kept, so there's no point rendering the rest
+                        return rendered
+                    rendered += 1
+        prerendered_rows[selected_player] = fingerprint
+    return rendered
+
+
+# Data version of the last finished pre-render pass, from any process
+def prerendered_version():
+    try:
+        return (IMAGE_CACHE_DIR / PRERENDER_DONE_FILE).read_text()
+    except OSError:
+        return None
+
+
+# Held while pre-rendering so that, of several gunicorn workers, only one renders
+# at a time; the others find the images on disk
+def prerender_lock():
+    return file_lock(IMAGE_CACHE_DIR / '.prerender.lock')
+
+
+# Pre-renders whenever the data version changes (workbook reload, Sheets sync).
+# Only one process does each version: a worker that finds the lock held leaves
+# the version to the holder, and one that gets the lock after the pass is done
+# finds the version in PRERENDER_DONE_FILE.
+def run_image_prerender():
+    version = None
+    while True:
+        dataset = current_dataset
+        if dataset['version'] != version:
+            try:
+                with prerender_lock() as locked:
+                    if locked and prerendered_version() != dataset['version']:
+                        rendered = prerender_images(dataset)
+                        (IMAGE_CACHE_DIR / PRERENDER_DONE_FILE).write_text(dataset['version'])
+                        print(f"Pre-rendered {rendered} chart images (data version {dataset['version']})")
+                version = dataset['version']
+            except Exception as e:
+                print(f"Error: chart image pre-render failed: {e}")
+        time.sleep(PRERENDER_POLL_SECONDS)
+
+
+# start of static export section
+
+# A copy of the dashboard that needs no Python to serve: every player's chart
+# data (the same payload as the 'player-chart-data' store) is written out as a
+# script file, next to static_site/'s page, assets/clientside_sort.js and
+# plotly.js. Picking a player and sorting both happen in the browser, so the
+# folder can go on any web host or file share. Rebuild it when the data changes.
+STATIC_SITE_DIR = Path(__file__).resolve().parent / 'static_site'
+
+# Charts on the static page, in the dashboard's order (the zone chart and the
+# leaderboard tables need the server, so they're left out)
+STATIC_SITE_CHARTS = [
+    'sprint-distance-chart', 'power-plays-chart', 'player-load-chart', 'acwr-chart',
+    'top-speed-chart', 'distance-per-min-chart', 'accel-decel-chart',
+]
+
+
+def static_json(value):
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
+    return json.dumps(value, separators=(',', ':'))
+
+
+def export_static_site(out_dir, season=None):
+    import shutil
+    from plotly.offline import get_plotlyjs
+
+    season = season or current_season
+    dataset = get_dataset(season)
+    out_dir = Path(out_dir)
+    (out_dir / 'data').mkdir(parents=True, exist_ok=True)
+
+    players = {}
+    for n, selected_player in enumerate(sorted(dataset['wide_index'])):
+        chart_data = get_player_chart_data(selected_player, dataset)
+        players[selected_player] = f"player-{n}.js"
+        (out_dir / 'data' / players[selected_player]).write_text(
+            f"gpsPlayerLoaded({static_json(selected_player)}, {static_json(chart_data)});\n", encoding='utf-8'
+        )
 
-    # Filter data for the selected player across all rounds
-    df_filtered = df[df['Player Name'] == selected_player]
+    site = {
+        'title': f"NPLW - GPS Player Data - {season}",
+        'charts': [{'id': chart_id, 'sortable': chart_id in CHART_BUILDERS} for chart_id in STATIC_SITE_CHARTS],
+        'players': players,
+        'teams': {
+            team: dataset['team_players'][team] for team in sorted_teams(dataset['team_players'])
+        },
+    }
+    (out_dir / 'data' / 'site.js').write_text(f"window.GPS_SITE = {static_json(site)};\n", encoding='utf-8')
 
-    # **Ensure columns are created before sorting or filtering**
-    acceleration_columns = [
-        'Accelerations Zone Count: 3 - 4 m/s/s',
-        'Accelerations Zone Count: > 4 m/s/s'
-    ]
-    deceleration_columns = [
-        'Deceleration Zone Count: 3 - 4 m/s/s',
-        'Deceleration Zone Count: > 4 m/s/s'
-    ]
+    (out_dir / 'plotly.min.js').write_text(get_plotlyjs(), encoding='utf-8')
+    shutil.copyfile(Path(__file__).resolve().parent / 'assets' / 'clientside_sort.js', out_dir / 'clientside_sort.js')
+    for name in ('index.html', 'static_app.js'):
+        shutil.copyfile(STATIC_SITE_DIR / name, out_dir / name)
+    print(f"Wrote {len(players)} players to {out_dir}")
+    return out_dir
 
-    # Create the necessary columns within the callback to ensure they exist
-    df_filtered['Total Accelerations >3m/s/s'] = df_filtered[acceleration_columns].sum(axis=1)
-    df_filtered['Total Decelerations >3m/s/s'] = df_filtered[deceleration_columns].sum(axis=1)
 
-    # Check if the columns were created successfully
-    if 'Total Accelerations >3m/s/s' not in df_filtered.columns:
-        print("Error: 'Total Accelerations >3m/s/s' column not found in the DataFrame.")
-        return go.Figure()  # Return an empty figure if the column is missing
+# start of callbacks section
 
-    # Now call the chart creation function
-    return create_accel_decel_chart(df_filtered, selected_player, sort_order)
 
+# Refreshes the title, team and player lists when another season or team is
+# picked, or when the server has a newer dataset than the page is showing.
+# The player selection is cleared if they didn't play for the chosen team.
+@app.callback(
+    Output('page-title', 'children'),
+    Output('team-dropdown', 'options'),
+    Output('player-dropdown', 'options'),
+    Output('player-dropdown', 'value'),
+    Output('leaderboard-period', 'options'),
+    Output('leaderboard-period', 'value'),
+    Output('dataset-version', 'data'),
+    Input('dataset-poll', 'n_intervals'),
+    Input('season-dropdown', 'value'),
+    Input('team-dropdown', 'value'),
+    State('player-dropdown', 'value'),
+    State('leaderboard-period', 'value'),
+    State('dataset-version', 'data')
+)
+def update_dataset_version(n_intervals, season, team, selected_player, period, page_version):
+    dataset = get_dataset(season)
+    version = f"{dataset['version']}|{team or ''}"
+    if version == page_version:
+        return (dash.no_update,) * 7
+
+    players = dataset['team_players'].get(team, []) if team else sorted(dataset['player_index'])
+    periods = get_leaderboard_periods(dataset, team)
+    return (
+        f"NPLW - GPS Player Data - {season or current_season}",
+        [{'label': team_name, 'value': team_name} for team_name in sorted_teams(dataset['team_players'])],
+        [{'label': player, 'value': player} for player in players],
+        selected_player if selected_player in players else None,
+        periods,
+        period if period in [option['value'] for option in periods] else 'season',
+        version
+    )
 
 
-# Define the callback to update the Distance Per Min chart
+# Squad leaderboard for the chosen season, team and period
 @app.callback(
-    Output('distance-per-min-chart', 'figure'),
-    [
-        Input('player-dropdown', 'value'),
-        Input('btn-dpm-date', 'n_clicks'),
-        Input('btn-dpm-value', 'n_clicks'),
-        Input('btn-dpm-form', 'n_clicks')
-    ]
+    Output('leaderboard-table', 'data'),
+    Output('leaderboard-table', 'columns'),
+    Input('leaderboard-period', 'value'),
+    Input('dataset-version', 'data'),
+    State('season-dropdown', 'value'),
+    State('team-dropdown', 'value')
 )
-def update_distance_per_min_chart(selected_player, btn_date, btn_value, btn_form):
-    if not selected_player:
-        return go.Figure()
+def update_leaderboard(period, page_version, season, team):
+    rows = get_leaderboard_rows(get_dataset(season), team, period or 'season')
+    return rows, table_columns(rows)
 
-    # Determine sort order based on clicked button
-    ctx = dash.callback_context
-    if not ctx.triggered:
-        sort_order = 'date'
-    else:
-        button_id = ctx.triggered[0]['prop_id'].split('.')[0]
-        if button_id == 'btn-dpm-value':
-            sort_order = 'value'
-        elif button_id == 'btn-dpm-form':
-            sort_order = 'form'
-        else:
-            sort_order = 'date'
 
-    # Filter the data
-    df_filtered = df[df['Player Name'] == selected_player]
+# Percentile / z-score ranking for the chosen metric, same season, team and period
+@app.callback(
+    Output('ranking-table', 'data'),
+    Output('ranking-table', 'columns'),
+    Input('ranking-metric', 'value'),
+    Input('leaderboard-period', 'value'),
+    Input('dataset-version', 'data'),
+    State('season-dropdown', 'value'),
+    State('team-dropdown', 'value')
+)
+def update_ranking(metric, period, page_version, season, team):
+    rows = get_ranking_rows(get_dataset(season), team, period or 'season', metric or 'Sprint Distance (m)')
+    return rows, table_columns(rows)
 
-    # Return updated chart
-    return create_distance_per_min_chart(df_filtered, selected_player, sort_order)
 
+# Sends the selected player's round charts and ACWR chart to the browser in one
+# go (again when the season, team, dataset version or accel/decel band changes).
+# The sort buttons never come back to the server - see the clientside callbacks below.
+@app.callback(
+    Output('player-chart-data', 'data'),
+    Input('player-dropdown', 'value'),
+    Input('dataset-version', 'data'),
+    Input('accel-decel-measure', 'value'),
+    Input('accel-decel-lower', 'value'),
+    Input('accel-decel-upper', 'value'),
+    State('season-dropdown', 'value'),
+    State('team-dropdown', 'value')
+)
+def update_player_chart_data(selected_player, page_version, measure, lower, upper, season, team):
+    if not selected_player:
+        return None
+    band = parse_accel_decel_band(measure, lower, upper)
+    return get_player_chart_data(selected_player, get_dataset(season), team, band)
 
 
-# Callback to update the Top Speed chart
+# The zone chart changes with its own dropdowns too, so it's drawn on the
+# server per (player, family, split) and cached rather than sent up front
 @app.callback(
-    Output('top-speed-chart', 'figure'),
-    [
-        Input('btn-top-speed-date', 'n_clicks'),
-        Input('btn-top-speed-value', 'n_clicks'),
-        Input('btn-top-speed-form', 'n_clicks'),
-        Input('player-dropdown', 'value')
-    ]
+    Output('zone-chart', 'figure'),
+    Input('player-dropdown', 'value'),
+    Input('zone-family', 'value'),
+    Input('zone-split', 'value'),
+    Input('dataset-version', 'data'),
+    State('season-dropdown', 'value'),
+    State('team-dropdown', 'value')
 )
-def update_top_speed_chart(btn_date, btn_value, btn_form, selected_player):
-    # Determine sort order based on the last clicked button
-    ctx = dash.callback_context
-    if not ctx.triggered:
-        sort_order = 'date'
-    else:
-        button_id = ctx.triggered[0]['prop_id'].split('.')[0]
-        if button_id == 'btn-top-speed-value':
-            sort_order = 'value'
-        elif button_id == 'btn-top-speed-form':
-            sort_order = 'form'
-        else:
-            sort_order = 'date'
-    
-    # Filter data for the selected player
-    df_filtered = df[df['Player Name'] == selected_player]
+def update_zone_chart(selected_player, family, split, page_version, season, team):
+    if not selected_player or family not in ZONE_FAMILIES:
+        return {'data': [], 'layout': {}}
+    return get_zone_figure_dict(selected_player, family, split, get_dataset(season), team)
+
+
+# Download Report buttons: start (or pick up) the player's report and poll once
+# a second until it's ready, then send it
+@app.callback(
+    Output('report-download', 'data'),
+    Output('report-poll', 'disabled'),
+    Output('report-status', 'children'),
+    Output('report-job', 'data'),
+    Input('btn-report-pptx', 'n_clicks'),
+    Input('btn-report-png', 'n_clicks'),
+    Input('report-poll', 'n_intervals'),
+    State('report-job', 'data'),
+    State('player-dropdown', 'value'),
+    State('season-dropdown', 'value'),
+    State('team-dropdown', 'value'),
+    prevent_initial_call=True
+)
+def download_report(pptx_clicks, png_clicks, n_intervals, job, selected_player, season, team):
+    if dash.ctx.triggered_id in ('btn-report-pptx', 'btn-report-png'):
+        if not selected_player:
+            return dash.no_update, True, "Select a player first", None
+        report_format = 'pptx' if dash.ctx.triggered_id == 'btn-report-pptx' else 'png'
+        job = {'player': selected_player, 'season': season, 'team': team, 'format': report_format}
+    if not job:
+        return dash.no_update, True, "", None
+
+    try:
+        report = get_report(job)
+    except Exception as e:
+        print(f"Error: report for {job['player']} failed: {e}")
+        return dash.no_update, True, "Report failed", None
+    if report is None:
+        return dash.no_update, False, "Rendering report...", job
+
+    file_name, content = report
+    return dcc.send_bytes(content, file_name), True, "", None
+
+
+# Round Order / Lowest to Highest / Form (Last 5 Rounds) buttons for each chart
+CHART_SORT_BUTTONS = {
+    'sprint-distance-chart': ['sprint-btn-date', 'sprint-btn-value', 'sprint-btn-form'],
+    'power-plays-chart': ['btn-date', 'btn-value', 'btn-form'],
+    'player-load-chart': ['btn-player-load-date', 'btn-player-load-value', 'btn-player-load-form'],
+    'top-speed-chart': ['btn-top-speed-date', 'btn-top-speed-value', 'btn-top-speed-form'],
+    'distance-per-min-chart': ['btn-dpm-date', 'btn-dpm-value', 'btn-dpm-form'],
+    'accel-decel-chart': ['btn-accel-decel-date', 'btn-accel-decel-value', 'btn-accel-decel-form'],
+}
+
+# Each chart re-sorts itself in the browser from the player-chart-data store
+for chart_id, button_ids in CHART_SORT_BUTTONS.items():
+    app.clientside_callback(
+        ClientsideFunction(namespace='gps', function_name='sort_chart'),
+        Output(chart_id, 'figure'),
+        [Input(button_id, 'n_clicks') for button_id in button_ids] + [Input('player-chart-data', 'data')],
+        State(chart_id, 'id')
+    )
 
-    # Create and return the Top Speed chart based on the determined order
-    return create_top_speed_chart(df_filtered, selected_player, sort_order)
+app.clientside_callback(
+    ClientsideFunction(namespace='gps', function_name='show_chart'),
+    Output('acwr-chart', 'figure'),
+    Input('player-chart-data', 'data'),
+    State('acwr-chart', 'id')
+)
 
 
 
-# Run the app
+# Run the app with Dash's development server (local use only - production runs
+# under gunicorn, see Procfile.txt). DASH_DEBUG=1 turns on the debugger and reloader.
+# The `report` subcommand writes PowerPoint player reports instead (see write_reports),
+# `prerender` fills the chart image cache (see prerender_images) and
+# `export-static` writes the no-server copy of the dashboard (see export_static_site).
 if __name__ == "__main__":
-    app.run(
-        host="0.0.0.0",
-        port=int(os.environ.get("PORT", 8050)),
-        debug=True
-    )
+    import argparse
+
+    parser = argparse.ArgumentParser(description="NPLW GPS player report dashboard")
+    commands = parser.add_subparsers(dest='command')
+    report_parser = commands.add_parser('report', help="write PowerPoint player reports")
+    report_parser.add_argument('--out', default='reports', help="output folder (default: reports)")
+    report_parser.add_argument('--players', nargs='+', help="only these players (default: everyone)")
+    report_parser.add_argument('--season', help=f"season (default: {current_season})")
+    report_parser.add_argument('--team', help="only this team's rounds and players")
+    report_parser.add_argument('--squad-deck', action='store_true', help="one deck for the squad instead of one per player")
+    report_parser.add_argument('--workers', type=int, help="rendering processes (default: one per CPU)")
+    commands.add_parser('prerender', help="render every player's chart images into the image cache")
+    export_parser = commands.add_parser('export-static', help="write a static copy of the dashboard")
+    export_parser.add_argument('--out', default='static_export', help="output folder (default: static_export)")
+    export_parser.add_argument('--season', help=f"season (default: {current_season})")
+    args = parser.parse_args()
+
+    if args.command == 'report':
+        write_reports(args.out, args.players, args.season, args.team, args.squad_deck, args.workers)
+    elif args.command == 'prerender':
+        print(f"Pre-rendered {prerender_images()} chart images")
+    elif args.command == 'export-static':
+        export_static_site(args.out, args.season)
+    else:
+        start_background_tasks()
+        app.run(
+            host="0.0.0.0",
+            port=int(os.environ.get("PORT", 8050)),
+            debug=os.environ.get("DASH_DEBUG") == "1"
+        )
 
@@ -0,0 +1,55 @@
+// Round Order / Lowest to Highest / Form (Last 5 Rounds) switching, done in the browser.
+// The server sends each chart once (in round order) plus the row order for every
+// sort mode in the 'player-chart-data' store; a sort click just reorders the
+// per-point arrays of each trace.
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    gps: {
+        sort_chart: function (btnDate, btnValue, btnForm, chartData, chartId) {
+            const chart = chartData && chartData[chartId];
+            if (!chart) {
+                return {data: [], layout: {}};
+            }
+
+            // The button that fired decides the order; a new player resets to round order
+            let sortOrder = 'date';
+            const triggered = window.dash_clientside.callback_context.triggered;
+            if (triggered && triggered.length) {
+                const buttonId = triggered[0].prop_id.split('.')[0];
+                if (buttonId.endsWith('-value')) {
+                    sortOrder = 'value';
+                } else if (buttonId.endsWith('-form')) {
+                    sortOrder = 'form';
+                }
+            }
+
+            return window.dash_clientside.gps.sort_figure(chart, sortOrder);
+        },
+
+        // The chart's figure with its points in one sort mode's order. Plain
+        // function, also used by the static export (static_site/static_app.js).
+        sort_figure: function (chart, sortOrder) {
+            const order = chart.orders[sortOrder];
+            const pointKeys = ['x', 'y', 'hovertext', 'text', 'customdata'];
+            const data = chart.figure.data.map(function (trace) {
+                const sorted = Object.assign({}, trace);
+                pointKeys.forEach(function (key) {
+                    if (Array.isArray(trace[key])) {
+                        sorted[key] = order.map(function (i) { return trace[key][i]; });
+                    }
+                });
+                return sorted;
+            });
+
+            return Object.assign({}, chart.figure, {data: data});
+        },
+
+        // Charts with no sort buttons just show the figure from the store
+        show_chart: function (chartData, chartId) {
+            const chart = chartData && chartData[chartId];
+            if (!chart) {
+                return {data: [], layout: {}};
+            }
+            return chart.figure;
+        }
+    }
+});
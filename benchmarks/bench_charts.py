@@ -0,0 +1,127 @@
+# Cost of every chart builder and of the server callbacks, and how it grows
+# with the data. For each scale the season is copied N times over (each copy
+# is a later "season" of the same players, so every player has N times the
+# rounds and the whole dataset N times the rows) and then:
+#   build_dataset      - the load-time tables (wide, load, zone, leaderboard)
+#   create_*           - each chart builder on a pre-sliced snapshot, for every
+#                        player and sort order (no caches involved)
+#   callbacks          - the update_* callbacks called directly, cold (empty
+#                        figure cache) and warm, plus the player-dropdown fan-out
+#                        (every server callback a player change triggers)
+#
+# Usage: python benchmarks/bench_charts.py [--scales 1 10 100] [--players N] [--json out.json]
+import argparse
+import json
+import time
+
+import pandas as pd
+
+from common import load_app, summarize_ms
+
+
+# The source rows repeated `factor` times, copy k shifted k years later with
+# its rounds renamed, so rounds and dates stay unique per player
+def scale_source(df, factor):
+    if factor == 1:
+        return df
+    copies = []
+    for k in range(factor):
+        df_copy = df.copy()
+        df_copy['Date'] = df_copy['Date'] + pd.DateOffset(years=k)
+        if k:
+            df_copy['Round'] = df_copy['Round'].astype(str) + f"-y{k}"
+        copies.append(df_copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+# `setup` runs untimed before each call (the cold passes empty the figure cache with it)
+def time_calls(calls, setup=None):
+    seconds = []
+    for call in calls:
+        if setup:
+            setup()
+        start = time.perf_counter()
+        call()
+        seconds.append(time.perf_counter() - start)
+    return summarize_ms(seconds)
+
+
+def bench_scale(app, df_source, factor, max_players):
+    df_scaled = scale_source(df_source, factor)
+    result = {'rows': len(df_scaled)}
+
+    start = time.perf_counter()
+    dataset = app.build_dataset(df_scaled, f"bench-x{factor}")
+    result['build_dataset_ms'] = round(1000 * (time.perf_counter() - start), 1)
+    app.current_dataset = dataset
+    players = sorted(dataset['wide_index'])[:max_players]
+
+    snapshots = {player: app.get_player_snapshot(player, dataset) for player in players}
+    result['charts'] = {}
+    for chart_id, builder in app.CHART_BUILDERS.items():
+        result['charts'][builder.__name__] = time_calls([
+            (lambda b=builder, p=player, s=sort_order: b(snapshots[p], p, s))
+            for player in players for sort_order in app.SORT_ORDERS
+        ])
+    result['charts']['create_acwr_chart'] = time_calls([
+        (lambda p=player: app.create_acwr_chart(app.player_load_days(p, dataset), p)) for player in players
+    ])
+    result['charts']['create_zone_chart'] = time_calls([
+        (lambda p=player: app.create_zone_chart(app.player_zone_rows(p, dataset), p, 'Distance in Speed Zones', 'game'))
+        for player in players
+    ])
+
+    band = app.DEFAULT_ACCEL_DECEL_BAND
+    callbacks = {
+        'update_player_chart_data': lambda p: app.update_player_chart_data(p, None, *band, None, None),
+        'update_zone_chart': lambda p: app.update_zone_chart(p, 'Distance in Speed Zones', 'game', None, None, None),
+        'update_leaderboard': lambda p: app.update_leaderboard('season', None, None, None),
+        'update_ranking': lambda p: app.update_ranking('Sprint Distance (m)', 'season', None, None, None),
+        'update_dataset_version': lambda p: app.update_dataset_version(0, None, None, p, 'season', None),
+    }
+    fan_out = ['update_player_chart_data', 'update_zone_chart']
+    result['callbacks'] = {}
+    # Cold: the cache is emptied before every timed call, so each one is a miss.
+    # Warm: every callback is run once per player first, so each one is a hit.
+    for state, setup in (('cold', app.figure_cache.clear), ('warm', None)):
+        if state == 'warm':
+            for callback in callbacks.values():
+                for player in players:
+                    callback(player)
+        for name, callback in callbacks.items():
+            result['callbacks'].setdefault(name, {})[state] = time_calls(
+                [(lambda c=callback, p=player: c(p)) for player in players], setup
+            )
+        result['callbacks'].setdefault('player change fan-out', {})[state] = time_calls([
+            (lambda p=player: [callbacks[name](p) for name in fan_out]) for player in players
+        ], setup)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100], help="dataset size multipliers")
+    parser.add_argument('--players', type=int, default=None, help="only time the first N players (default: all)")
+    parser.add_argument('--json', help="also write the results to this file")
+    args = parser.parse_args()
+
+    app = load_app()
+    df_source = app.load_source_data(app.source_file)[0]
+    max_players = args.players or len(app.current_dataset['wide_index'])
+
+    results = {}
+    for factor in args.scales:
+        r = results[f"x{factor}"] = bench_scale(app, df_source, factor, max_players)
+        print(f"x{factor}: {r['rows']} rows, build_dataset {r['build_dataset_ms']:.0f} ms")
+        for name, stats in r['charts'].items():
+            print(f"  {name:<32} mean {stats['mean_ms']:>9.2f} ms   max {stats['max_ms']:>9.2f} ms   n {stats['n']}")
+        for name, states in r['callbacks'].items():
+            print(f"  {name:<32} cold {states['cold']['mean_ms']:>9.2f} ms   warm {states['warm']['mean_ms']:>9.2f} ms")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
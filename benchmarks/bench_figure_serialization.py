@@ -0,0 +1,61 @@
+# Per-request cost of answering a chart callback:
+#   build + encode - what every click used to cost: go.Figure(...) + update_layout(...)
+#                    and then Dash encoding the figure into the response
+#   cached figure  - a go.Figure kept from an earlier build (held here, the app
+#                    no longer caches these), still validated/encoded per response
+#   cached json    - pre-serialized figure dict from the cache (what the browser is sent)
+#
+# Usage: python benchmarks/bench_figure_serialization.py [--players N]
+import argparse
+import time
+
+from plotly.io.json import to_json_plotly  # what Dash uses to encode callback responses
+
+from common import load_app, summarize_ms
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--players', type=int, default=10, help="number of players to time")
+    args = parser.parse_args()
+
+    app_module = load_app()
+    players = sorted(app_module.current_dataset['wide_index'])[:args.players]
+    requests = [
+        (chart_id, player, sort_order)
+        for player in players
+        for chart_id in app_module.CHART_BUILDERS
+        for sort_order in app_module.SORT_ORDERS
+    ]
+
+    timings = {'build + encode': [], 'cached figure': [], 'cached json': []}
+    for chart_id, player, sort_order in requests:
+        start = time.perf_counter()
+        to_json_plotly(app_module.build_chart_figure(chart_id, player, sort_order))
+        timings['build + encode'].append(time.perf_counter() - start)
+
+    figures = {}
+    for chart_id, player, sort_order in requests:
+        figures[chart_id, player, sort_order] = app_module.build_chart_figure(chart_id, player, sort_order)
+        app_module.get_chart_figure_dict(chart_id, player, sort_order)
+
+    for chart_id, player, sort_order in requests:
+        start = time.perf_counter()
+        to_json_plotly(figures[chart_id, player, sort_order])
+        timings['cached figure'].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        to_json_plotly(app_module.get_chart_figure_dict(chart_id, player, sort_order))
+        timings['cached json'].append(time.perf_counter() - start)
+
+    print(f"{len(requests)} chart requests ({len(players)} players x 6 charts x 3 sort orders), "
+          f"JSON engine: {app_module.FIGURE_JSON_ENGINE}")
+    baseline = summarize_ms(timings['build + encode'])['mean_ms']
+    for path, seconds in timings.items():
+        stats = summarize_ms(seconds)
+        print(f"  {path:<15} mean {stats['mean_ms']:>8.3f} ms   median {stats['median_ms']:>8.3f} ms   "
+              f"x{baseline / stats['mean_ms']:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# Workbook load cost: wall time and peak memory of each way of reading the
+# 'individual stats' sheet. Every loader runs in its own process (with the app
+# and its cache already loaded) and the kernel's peak-RSS counter is reset just
+# before it starts, so "peak" is what the load itself adds. Linux only (/proc).
+#
+# Usage: python benchmarks/bench_ingest.py [--loaders read_excel stream arrow_cache] [--json out.json]
+import argparse
+import json
+import subprocess
+import sys
+
+from common import APP_MODULE, REPO_ROOT
+
+LOADERS = {
+    # What the app did before: every column, dtypes inferred by pandas
+    'read_excel': "pd.read_excel(app.source_file, sheet_name=app.source_sheet)",
+    # Streaming read-only parse of just the SOURCE_DTYPES columns
+    'stream': "app.read_sheet_columns(app.source_file)",
+    # Normal start: memory-map the Arrow copy written by an earlier parse
+    'arrow_cache': "app.load_source_data(app.source_file)[0]",
+}
+
+CHILD = """
+import gc, importlib, json, sys, time
+sys.path.insert(0, {repo!r})
+import pandas as pd
+app = importlib.import_module({module!r})
+
+def status_kb(field):
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(field + ':'):
+                return int(line.split()[1])
+
+gc.collect()
+with open('/proc/self/clear_refs', 'w') as f:
+    f.write('5')  # resets VmHWM (peak RSS) to the current RSS
+rss_before = status_kb('VmRSS')
+start = time.perf_counter()
+df = {expr}
+wall_seconds = time.perf_counter() - start
+print(json.dumps({{
+    'wall_ms': round(wall_seconds * 1000, 1),
+    'peak_rss_mb': round((status_kb('VmHWM') - rss_before) / 1024, 1),
+    'frame_mb': round(df.memory_usage(deep=True).sum() / 1e6, 2),
+    'shape': list(df.shape),
+}}))
+"""
+
+
+def run_loader(expr):
+    result = subprocess.run(
+        [sys.executable, '-c', CHILD.format(repo=str(REPO_ROOT), module=APP_MODULE, expr=expr)],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        print(result.stderr[-2000:])
+        sys.exit(result.returncode)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--loaders', nargs='+', choices=list(LOADERS), default=list(LOADERS))
+    parser.add_argument('--json', help="also write the results to this file")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.loaders:
+        results[name] = run_loader(LOADERS[name])
+        r = results[name]
+        print(f"{name:<12} {r['wall_ms']:>8.1f} ms   peak +{r['peak_rss_mb']:>6.1f} MB   "
+              f"frame {r['frame_mb']:>5.2f} MB   {r['shape'][0]} x {r['shape'][1]}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+# Requests/sec of the dashboard under Dash's dev server (the old
+# `python 2025_gps_player_report_code.py` with debug=True) vs gunicorn with and
+# without preload_app, plus the memory the whole process tree uses (Linux PSS, so pages
+# shared copy-on-write between workers are only counted once).
+#
+# Each request is the player-dropdown callback, cycling through every player.
+#
+# Usage: python benchmarks/bench_server.py [--mode all|dev|gunicorn|gunicorn-no-preload] [--workers 4] [--clients 8] [--seconds 10]
+import argparse
+import itertools
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+import requests
+
+from common import APP_MODULE, REPO_ROOT, load_app, summarize_ms
+
+PORT = 8765
+
+
+def port_in_use():
+    try:
+        requests.get(f"http://127.0.0.1:{PORT}/", timeout=2)
+        return True
+    except (requests.ConnectionError, requests.Timeout):
+        return False
+
+
+def start_server(mode, workers):
+    if port_in_use():
+        raise RuntimeError(f"something is already listening on port {PORT}")
+
+    # Build every player's charts before serving, so both modes are timed warm.
+    # With preload_app that happens once in the master and is shared by all workers.
+    env = dict(os.environ, PORT=str(PORT), GPS_PREWARM_FIGURES='1')
+    if mode == 'dev':
+        env['DASH_DEBUG'] = '1'
+        command = [sys.executable, f"{APP_MODULE}.py"]
+    else:
+        env['WEB_CONCURRENCY'] = str(workers)
+        env['GUNICORN_PRELOAD'] = '0' if mode == 'gunicorn-no-preload' else '1'
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', f"{APP_MODULE}:server"]
+    process = subprocess.Popen(
+        command, cwd=REPO_ROOT, env=env, start_new_session=True,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    deadline = time.time() + 300
+    while time.time() < deadline and process.poll() is None:
+        try:
+            if requests.get(f"http://127.0.0.1:{PORT}/", timeout=2).status_code == 200:
+                return process
+        except (requests.ConnectionError, requests.Timeout):
+            pass
+        time.sleep(0.5)
+    stop_server(process)
+    raise RuntimeError(f"{mode} server did not start")
+
+
+def stop_server(process):
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+    except ProcessLookupError:
+        pass
+    process.wait(timeout=30)
+
+
+# Proportional set size of the server and all its children, in MB
+def tree_pss_mb(pid):
+    pids, total_kb = [pid], 0
+    while pids:
+        current = pids.pop()
+        try:
+            for line in Path(f"/proc/{current}/smaps_rollup").read_text().splitlines():
+                if line.startswith('Pss:'):
+                    total_kb += int(line.split()[1])
+            for task in Path(f"/proc/{current}/task").iterdir():
+                pids.extend(int(child) for child in (task / 'children').read_text().split())
+        except OSError:
+            continue
+    return total_kb / 1024 if total_kb else None
+
+
+# Every input and state update_player_chart_data declares (Dash answers 500 if
+# any is missing), with the values the page starts with
+def callback_body(app, player):
+    measure, lower, upper = app.DEFAULT_ACCEL_DECEL_BAND
+    return {
+        'output': 'player-chart-data.data',
+        'outputs': {'id': 'player-chart-data', 'property': 'data'},
+        'inputs': [
+            {'id': 'player-dropdown', 'property': 'value', 'value': player},
+            {'id': 'dataset-version', 'property': 'data', 'value': None},
+            {'id': 'accel-decel-measure', 'property': 'value', 'value': measure},
+            {'id': 'accel-decel-lower', 'property': 'value', 'value': lower},
+            {'id': 'accel-decel-upper', 'property': 'value', 'value': 'above' if upper is None else upper},
+        ],
+        'state': [
+            {'id': 'season-dropdown', 'property': 'value', 'value': app.current_season},
+            {'id': 'team-dropdown', 'property': 'value', 'value': None},
+        ],
+        'changedPropIds': ['player-dropdown.value'],
+    }
+
+
+def run_load(app, players, clients, seconds):
+    bodies = itertools.cycle([callback_body(app, player) for player in players])
+    body_lock = threading.Lock()
+    latencies, errors = [], []
+    stop_at = time.time() + seconds
+
+    def client():
+        session = requests.Session()
+        while time.time() < stop_at:
+            with body_lock:
+                body = next(bodies)
+            start = time.perf_counter()
+            try:
+                response = session.post(f"http://127.0.0.1:{PORT}/_dash-update-component", json=body, timeout=60)
+            except requests.RequestException as e:
+                errors.append(type(e).__name__)
+                continue
+            if response.status_code == 200:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors.append(response.status_code)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--mode', choices=['all', 'dev', 'gunicorn', 'gunicorn-no-preload'], default='all')
+    parser.add_argument('--workers', type=int, default=4, help="gunicorn workers")
+    parser.add_argument('--clients', type=int, default=8, help="concurrent clients")
+    parser.add_argument('--seconds', type=float, default=10)
+    args = parser.parse_args()
+
+    app = load_app()
+    players = sorted(app.current_dataset['wide_index'])
+    modes = ['dev', 'gunicorn', 'gunicorn-no-preload'] if args.mode == 'all' else [args.mode]
+    for mode in modes:
+        process = start_server(mode, args.workers)
+        try:
+            run_load(app, players, args.clients, 2)
+            latencies, errors = run_load(app, players, args.clients, args.seconds)
+            memory = tree_pss_mb(process.pid)
+        finally:
+            stop_server(process)
+
+        label = {
+            'dev': 'dev server (debug)',
+            'gunicorn': f"gunicorn preload x{args.workers}",
+            'gunicorn-no-preload': f"gunicorn no preload x{args.workers}",
+        }[mode]
+        stats = summarize_ms(latencies)
+        memory_text = f"{memory:.0f} MB PSS" if memory else "PSS n/a"
+        median_text = f"median {stats['median_ms']:.1f} ms" if stats else "no successful requests"
+        print(f"{label:<26} {len(latencies) / args.seconds:>8.1f} req/s   "
+              f"{median_text}   errors {len(errors)}   {memory_text}")
+        if errors:
+            print(f"  errors by status: {dict(Counter(errors))}")
+
+
+if __name__ == "__main__":
+    main()
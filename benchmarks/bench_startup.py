@@ -0,0 +1,68 @@
+# Worker cold-start check: imports the app under `python -X importtime` and
+# reports where the time goes. Fails (exit code 1) if a module that should only
+# load on first use gets imported at startup, or if startup goes over --max-ms.
+#
+# Usage: python benchmarks/bench_startup.py [--top 15] [--max-ms 5000]
+import argparse
+import subprocess
+import sys
+import time
+
+from common import APP_MODULE, REPO_ROOT
+
+# Only needed for Sheets sync, report export and ad-hoc charts - never on boot
+LAZY_MODULES = ['gspread', 'oauth2client', 'pptx', 'plotly.express', 'kaleido']
+
+
+def run_importtime():
+    code = f"import importlib, sys; sys.path.insert(0, {str(REPO_ROOT)!r}); importlib.import_module({APP_MODULE!r})"
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    wall_seconds = time.perf_counter() - start
+    if result.returncode != 0:
+        print(result.stderr[-2000:])
+        sys.exit(result.returncode)
+
+    # Lines look like: "import time:   self [us] | cumulative | <indent>module"
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        level = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        imports.append((name.strip(), level, int(cumulative_us)))
+    return wall_seconds, imports
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--top', type=int, default=15, help="how many top-level imports to list")
+    parser.add_argument('--max-ms', type=float, default=None, help="fail if the whole startup takes longer")
+    args = parser.parse_args()
+
+    wall_seconds, imports = run_importtime()
+    top_level = sorted((item for item in imports if item[1] == 0), key=lambda item: -item[2])
+    import_seconds = sum(cumulative_us for _, _, cumulative_us in top_level) / 1e6
+
+    print(f"startup (imports + data load + layout): {wall_seconds * 1000:.0f} ms")
+    print(f"imports: {import_seconds * 1000:.0f} ms")
+    for name, _, cumulative_us in top_level[:args.top]:
+        print(f"  {cumulative_us / 1000:>8.1f} ms  {name}")
+
+    loaded = {name for name, _, _ in imports}
+    eager = [name for name in LAZY_MODULES if name in loaded]
+    failed = False
+    if eager:
+        print(f"FAIL: imported at startup but should load on first use: {', '.join(eager)}")
+        failed = True
+    if args.max_ms is not None and wall_seconds * 1000 > args.max_ms:
+        print(f"FAIL: startup took longer than {args.max_ms:.0f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import importlib
+import os
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+APP_MODULE = '2025_gps_player_report_code'
+
+
+# The app module's name starts with a digit, so it can't be imported with a
+# plain import statement. It also reads the workbook relative to the repo root.
+def load_app():
+    os.chdir(REPO_ROOT)
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    return importlib.import_module(APP_MODULE)
+
+
+# None when nothing was timed (e.g. every request failed), so callers report
+# that instead of dividing by zero
+def summarize_ms(seconds):
+    if not seconds:
+        return None
+    seconds = sorted(seconds)
+    return {
+        'mean_ms': round(1000 * sum(seconds) / len(seconds), 3),
+        'median_ms': round(1000 * seconds[len(seconds) // 2], 3),
+        'max_ms': round(1000 * seconds[-1], 3),
+        'n': len(seconds),
+    }
@@ -0,0 +1,29 @@
+# gunicorn settings for production, used by Procfile.txt:
+#   gunicorn -c gunicorn.conf.py 2025_gps_player_report_code:server
+import gc
+import importlib
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8050')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+threads = int(os.environ.get("GUNICORN_THREADS", 1))
+timeout = 60
+
+# Import the app - and with it read the workbook and build df and the derived
+# tables - once in the master process, before forking. Workers then share those
+# memory pages copy-on-write instead of each loading their own copy.
+# GUNICORN_PRELOAD=0 turns this off (only useful for comparing memory use).
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") == "1"
+
+
+# Runs in the master after the app is loaded, before any worker is forked.
+# Freezing moves everything loaded so far out of the garbage collector's reach,
+# so collections in the workers don't write to (and un-share) those pages.
+def when_ready(server):
+    gc.freeze()
+
+
+# Runs in each worker once the app is loaded. Threads don't survive a fork, so
+# the app's background tasks (Google Sheets sync) are started here per worker.
+def post_worker_init(worker):
+    importlib.import_module("2025_gps_player_report_code").start_background_tasks()
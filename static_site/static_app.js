@@ -0,0 +1,97 @@
+// Static export of the dashboard: player picking and sorting without a server.
+// data/site.js (written by export_static_site) lists the charts and players;
+// each player's charts are in their own data/player-N.js, the same payload the
+// live app puts in its 'player-chart-data' store. A player's file is loaded
+// with a <script> tag the first time they're picked, so the site also works
+// opened straight from a file share (no fetch).
+(function () {
+    const site = window.GPS_SITE;
+    const playerData = {};
+    let currentPlayer = null;
+
+    const sortButtons = [
+        ['date', 'Round Order'],
+        ['value', 'Lowest to Highest'],
+        ['form', 'Form (Last 5 Rounds)']
+    ];
+
+    function draw(chartId, sortOrder) {
+        const chart = playerData[currentPlayer] && playerData[currentPlayer][chartId];
+        if (!chart) {
+            return;
+        }
+        const figure = chart.orders
+            ? window.dash_clientside.gps.sort_figure(chart, sortOrder)
+            : chart.figure;
+        Plotly.react(chartId, figure.data, figure.layout, {responsive: true});
+    }
+
+    function showPlayer(name) {
+        currentPlayer = name;
+        site.charts.forEach(function (chart) { draw(chart.id, 'date'); });
+    }
+
+    // Called by each data/player-N.js as it loads
+    window.gpsPlayerLoaded = function (name, data) {
+        playerData[name] = data;
+        if (name === currentPlayer) {
+            showPlayer(name);
+        }
+    };
+
+    function pickPlayer(name) {
+        currentPlayer = name;
+        if (playerData[name]) {
+            showPlayer(name);
+            return;
+        }
+        const script = document.createElement('script');
+        script.src = 'data/' + site.players[name];
+        document.head.appendChild(script);
+    }
+
+    function buildPage() {
+        document.title = site.title;
+        document.getElementById('page-title').textContent = site.title;
+
+        const select = document.getElementById('player-select');
+        select.appendChild(new Option('Select a Player', ''));
+        Object.keys(site.teams).forEach(function (team) {
+            const group = document.createElement('optgroup');
+            group.label = team;
+            site.teams[team].forEach(function (name) {
+                group.appendChild(new Option(name, name));
+            });
+            select.appendChild(group);
+        });
+        select.addEventListener('change', function () {
+            if (select.value) {
+                pickPlayer(select.value);
+            }
+        });
+
+        const charts = document.getElementById('charts');
+        site.charts.forEach(function (chart) {
+            const section = document.createElement('div');
+            section.className = 'chart-section';
+            if (chart.sortable) {
+                const buttons = document.createElement('div');
+                buttons.className = 'sort-buttons';
+                sortButtons.forEach(function (button) {
+                    const element = document.createElement('button');
+                    element.textContent = button[1];
+                    element.addEventListener('click', function () { draw(chart.id, button[0]); });
+                    buttons.appendChild(element);
+                });
+                section.appendChild(buttons);
+            }
+            const plot = document.createElement('div');
+            plot.id = chart.id;
+            plot.className = 'chart';
+            section.appendChild(plot);
+            charts.appendChild(section);
+        });
+    }
+
+    buildPage();
+})();
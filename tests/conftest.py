@@ -0,0 +1,23 @@
+import importlib
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+APP_MODULE = '2025_gps_player_report_code'
+
+
+# The app module (its name starts with a digit, so no plain import; it reads the
+# workbook relative to the repo root). Tests that swap current_dataset get the
+# loaded one back afterwards.
+@pytest.fixture(scope='module')
+def app():
+    os.chdir(REPO_ROOT)
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    app = importlib.import_module(APP_MODULE)
+    loaded_dataset = app.current_dataset
+    yield app
+    app.current_dataset = loaded_dataset
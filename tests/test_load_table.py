@@ -0,0 +1,46 @@
+# update_load_table's incremental path against a full rebuild: the rows held
+# first go through a first build, the rest are added as an update, and the
+# result has to match building the load table from all rows at once.
+#
+# Run from the repo root: python -m pytest tests
+import pandas as pd
+import pytest
+
+
+def session_days(df):
+    return sorted(df['Date'].dt.normalize().unique())
+
+
+def split_last_days(df, days):
+    cutoff = session_days(df)[-days]
+    return df[df['Date'] < cutoff], df[df['Date'] >= cutoff]
+
+
+def split_middle_day(df):
+    days = session_days(df)
+    middle = df['Date'].dt.normalize() == days[len(days) // 2]
+    return df[~middle], df[middle]
+
+
+def split_player(df):
+    player = df['Player Name'].astype(str).sort_values().iloc[0]
+    added = df['Player Name'] == player
+    return df[~added], df[added]
+
+
+@pytest.mark.parametrize('split', [
+    pytest.param(lambda df: split_last_days(df, 1), id='last day'),
+    pytest.param(lambda df: split_last_days(df, 3), id='last 3 days'),
+    pytest.param(lambda df: split_last_days(df, 8), id='last 8 days'),
+    pytest.param(split_middle_day, id='backfilled middle day'),
+    pytest.param(split_player, id='new player'),
+])
+def test_incremental_update_matches_full_build(app, split):
+    df = app.current_dataset['df']
+    df_held, df_added = split(df)
+    assert not df_held.empty and not df_added.empty
+
+    expected = app.update_load_table(None, df)
+    updated = app.update_load_table(app.update_load_table(None, df_held), df_added)
+
+    pd.testing.assert_frame_equal(updated, expected, check_exact=False, rtol=1e-4, atol=1e-3)
@@ -0,0 +1,75 @@
+# sync_from_worksheet against a fake worksheet: the workbook minus its last
+# round is the loaded data, the whole workbook is the sheet (dates as serial
+# day numbers, blanks as '', like gspread's UNFORMATTED_VALUE / SERIAL_NUMBER).
+#
+# Run from the repo root: python -m pytest tests
+import numpy as np
+import pandas as pd
+
+
+def sheet_cell(value):
+    if isinstance(value, pd.Timestamp):
+        return (value - pd.Timestamp('1899-12-30')) / pd.Timedelta(days=1)
+    if value is None or value is pd.NaT or (isinstance(value, float) and np.isnan(value)):
+        return ''
+    return value.item() if hasattr(value, 'item') else value
+
+
+# Just the three gspread Worksheet methods the sync uses
+class FakeWorksheet:
+    def __init__(self, df):
+        self.rows = [list(df.columns)] + [[sheet_cell(value) for value in row] for row in df.itertuples(index=False)]
+
+    def row_values(self, row):
+        return self.rows[row - 1]
+
+    def col_values(self, col):
+        return [row[col - 1] for row in self.rows if row[col - 1] != '']
+
+    def get(self, range_name, value_render_option=None, date_time_render_option=None):
+        assert value_render_option == 'UNFORMATTED_VALUE'
+        assert date_time_render_option == 'SERIAL_NUMBER'
+        first, last = map(int, range_name.split(':'))
+        return [list(row) for row in self.rows[first - 1:last]]
+
+
+def test_sync_merges_only_new_rows(app):
+    df_source, version = app.load_source_data(app.source_file)
+    last_round = df_source.sort_values('Date')['Round'].iloc[-1]
+    df_held = df_source[df_source['Round'] != last_round]
+    app.current_dataset = app.build_dataset(df_held, version)
+    expected = app.build_dataset(df_source, version)
+
+    worksheet = FakeWorksheet(df_source)
+    state = {'rows_synced': 1, 'header': None}
+
+    # The first sync reads the whole sheet; the rows already held are skipped
+    assert app.sync_from_worksheet(worksheet, state) == len(df_source) - len(df_held)
+    assert state['rows_synced'] == len(worksheet.rows)
+    assert app.sync_from_worksheet(worksheet, state) == 0
+
+    dataset = app.current_dataset
+    pd.testing.assert_frame_equal(dataset['df'], expected['df'], check_dtype=False)
+    pd.testing.assert_frame_equal(dataset['df_wide'], expected['df_wide'], check_dtype=False)
+    assert dataset['wide_index'] == expected['wide_index']
+    # Serial-number dates came back as the workbook's dates
+    new_dates = dataset['df'].loc[dataset['df']['Round'] == last_round, 'Date']
+    assert set(new_dates) == set(df_source.loc[df_source['Round'] == last_round, 'Date'])
+
+
+def test_sync_picks_up_rows_appended_later(app):
+    df_source, version = app.load_source_data(app.source_file)
+    app.current_dataset = app.build_dataset(df_source, version)
+    worksheet = FakeWorksheet(df_source)
+    state = {'rows_synced': 1, 'header': None}
+    assert app.sync_from_worksheet(worksheet, state) == 0
+
+    # A new round: the last round's rows again, a week later
+    last_round = df_source.sort_values('Date')['Round'].iloc[-1]
+    df_next = df_source[df_source['Round'] == last_round].copy()
+    df_next['Round'] = f"{last_round}-next"
+    df_next['Date'] = df_next['Date'] + pd.Timedelta(days=7)
+    worksheet.rows += FakeWorksheet(df_next).rows[1:]
+
+    assert app.sync_from_worksheet(worksheet, state) == len(df_next)
+    assert (app.current_dataset['df']['Round'] == f"{last_round}-next").sum() == len(df_next)
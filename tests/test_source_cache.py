@@ -0,0 +1,67 @@
+# load_source_data's Arrow cache: when it parses the workbook, when it only
+# re-hashes it, and when it replaces the cache. The cache goes in tmp_path.
+#
+# Run from the repo root: python -m pytest tests
+import json
+import os
+import shutil
+
+import pytest
+
+
+@pytest.fixture
+def workbook(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(app, 'cache_dir', tmp_path / 'cache')
+    path = tmp_path / 'season.xlsx'
+    shutil.copyfile(app.source_file, path)
+    return path
+
+
+def fail_to_parse(*args, **kwargs):
+    raise AssertionError("the workbook was parsed again")
+
+
+def test_first_load_writes_cache_and_meta(app, workbook):
+    df, version = app.load_source_data(workbook)
+
+    caches = list(app.cache_dir.glob('season-*.arrow'))
+    assert len(caches) == 1
+    meta = json.loads((app.cache_dir / 'season.json').read_text())
+    assert meta['sha256'].startswith(version)
+    assert meta['format'] == app.CACHE_FORMAT_VERSION
+    assert meta['size'] == workbook.stat().st_size
+    assert len(df) == len(app.current_dataset['df'])
+
+
+def test_touched_workbook_is_rehashed_not_reparsed(app, workbook, monkeypatch):
+    df, version = app.load_source_data(workbook)
+    stat = workbook.stat()
+    os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    hashed = []
+    monkeypatch.setattr(app, 'read_sheet_columns', fail_to_parse)
+    monkeypatch.setattr(app, 'file_sha256', lambda path, real=app.file_sha256: hashed.append(path) or real(path))
+    df_again, version_again = app.load_source_data(workbook)
+
+    assert hashed == [workbook]
+    assert version_again == version
+    assert df_again.equals(df)
+    meta = json.loads((app.cache_dir / 'season.json').read_text())
+    assert meta['mtime_ns'] == workbook.stat().st_mtime_ns
+
+
+def test_changed_workbook_replaces_cache(app, workbook, monkeypatch):
+    df, version = app.load_source_data(workbook)
+    old_cache, = app.cache_dir.glob('season-*.arrow')
+
+    # Trailing bytes change the content hash; the parse is stubbed, so they're never read
+    with open(workbook, 'ab') as f:
+        f.write(b'changed')
+    monkeypatch.setattr(app, 'read_sheet_columns', lambda path, sheet_name: df.head(10))
+    df_new, version_new = app.load_source_data(workbook)
+
+    assert version_new != version
+    assert len(df_new) == 10
+    new_cache, = app.cache_dir.glob('season-*.arrow')
+    assert new_cache != old_cache
+    assert not old_cache.exists()